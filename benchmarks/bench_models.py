@@ -0,0 +1,118 @@
+"""Memory and serialization benchmark for search result storage.
+
+Compares the original plain SearchResult dataclass (serialized via asdict),
+the current interning SearchResult, and SearchResultSet on synthetic batch
+output shaped like real docserver results.
+
+Usage:
+    uv run python benchmarks/bench_models.py [--results 200000]
+"""
+
+import argparse
+import io
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from comsol_doc.models import SearchResult, SearchResultSet
+
+MODULES = [
+    "Battery Design Module", "CFD Module", "Heat Transfer Module",
+    "Structural Mechanics Module", "Application Programming Guide",
+]
+TERMS = ["battery aging", "capacity fade", "turbulent flow", "phase change", "model object"]
+
+
+@dataclass
+class LegacySearchResult:
+    """SearchResult as it was before interning: plain fields, asdict() copy."""
+    module: str
+    title: str
+    path: str
+    snippet: str
+    search_term: str
+    version: str
+    url: Optional[str] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def make_results(count, cls=SearchResult):
+    """Yield synthetic results with realistic duplication across fields."""
+    for i in range(count):
+        module = MODULES[i % len(MODULES)]
+        # Build strings dynamically so they start out as distinct objects,
+        # as they would when read from the browser
+        path = " > ".join(["COMSOL Multiphysics", "Reference Manual", module, f"Chapter {i % 40}"])
+        yield cls(
+            module="".join(module),
+            title=f"Result title {i}",
+            path=path,
+            snippet=f"Snippet text for result {i} " * 4,
+            search_term="".join(TERMS[i % len(TERMS)]),
+            version=".".join(["6", "4"]),
+            url=f"https://doc.comsol.com/6.4/docserver/#!/com.comsol.help.comsol/page_{i}.html",
+        )
+
+
+def measure(label, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {current / 1e6:>9.1f} MB {elapsed:>8.3f} s")
+    return obj
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    out = fn()
+    print(f"{label:<40} {'':>12} {time.perf_counter() - start:>8.3f} s")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{args.results} results\n")
+    print(f"{'':<40} {'memory':>12} {'time':>10}")
+    legacy = measure(
+        "list[LegacySearchResult] (baseline)",
+        lambda: list(make_results(args.results, LegacySearchResult)),
+    )
+    results = measure("list[SearchResult] (interned)", lambda: list(make_results(args.results)))
+    result_set = measure("SearchResultSet", lambda: SearchResultSet(make_results(args.results)))
+    print()
+
+    def jsonl(items):
+        fp = io.StringIO()
+        for r in items:
+            fp.write(json.dumps(r.to_dict(), ensure_ascii=False) + "\n")
+        return fp.getvalue()
+
+    def set_jsonl():
+        fp = io.StringIO()
+        result_set.dump_jsonl(fp)
+        return fp.getvalue()
+
+    baseline = timed("JSONL: legacy list + asdict", lambda: jsonl(legacy))
+    current = timed("JSONL: list + to_dict", lambda: jsonl(results))
+    assert baseline == current, "JSONL output differs"
+    compact = timed("JSONL: SearchResultSet.dump_jsonl", set_jsonl)
+    assert baseline == compact, "JSONL output differs"
+    data = timed("binary: SearchResultSet.to_bytes", result_set.to_bytes)
+    restored = timed("binary: SearchResultSet.from_bytes", lambda: SearchResultSet.from_bytes(data))
+    assert len(restored) == len(results)
+    print(f"\nJSONL size:  {len(baseline.encode('utf-8')) / 1e6:.1f} MB")
+    print(f"binary size: {len(data) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Throughput benchmark for parallel HTML post-processing.
+
+Simulates a browser that captures one page every --capture-ms milliseconds
+and feeds synthetic docserver HTML through PostProcessor with an increasing
+number of worker processes. Covers both batch search pages and crawl
+(documentation) pages, with output formatting done in the workers.
+
+Usage:
+    uv run python benchmarks/bench_pipeline.py [--pages 400] [--capture-ms 20]
+"""
+
+import argparse
+import os
+import time
+
+from comsol_doc.pipeline import PostProcessor, process_search_html, process_document_html
+
+BASE_URL = "https://doc.comsol.com/6.4/docserver/"
+
+
+def search_page(results=50):
+    """Build a search results page shaped like the docserver's markup."""
+    rows = []
+    for i in range(results):
+        crumbs = "".join(
+            f'<span class="searchResultsPathLink">{seg}</span><span class="searchResultsPathLink">&gt;</span>'
+            for seg in ["COMSOL Multiphysics", "Battery Design Module User's Guide",
+                        "Battery Design Module User's Guide", f"Lithium-Ion Battery {i}"]
+        )
+        rows.append(
+            '<div class="v-verticallayout">'
+            f'<a class="searchResultsLink" href="#!/com.comsol.help.battery/page_{i}.html">Result {i}</a>'
+            f'<div class="searchResultsPath">{crumbs}</div>'
+            '<div class="searchHit">'
+            + f'Capacity fade and <b>battery aging</b> in cell {i}. ' * 8
+            + '</div>'
+            '</div>'
+        )
+    return f'<html><body><div class="searchResults">{"".join(rows)}</div></body></html>'
+
+
+def document_page(sections=40):
+    """Build a documentation page with several content panels."""
+    body = "".join(
+        f'<div class="v-panel-content"><h2>Section {i}</h2>'
+        + "".join(f"<p>Paragraph {j} of section {i} about <i>heat transfer</i> in solids.</p>" for j in range(15))
+        + "<ul>" + "".join(f"<li>Item {k}</li>" for k in range(10)) + "</ul></div>"
+        for i in range(sections)
+    )
+    return f'<html><body><div class="searchResultsPathLink">Heat Transfer Module</div>{body}</body></html>'
+
+
+def run(workers, pages, capture_s, kind):
+    html = search_page() if kind == "batch" else document_page()
+
+    def capture(i):
+        time.sleep(capture_s)  # Browser time per page
+        if kind == "batch":
+            return html, f"term {i}", "6.4", BASE_URL, 50, "markdown"
+        return html, f"{BASE_URL}#!/page_{i}.html", f"Page {i}", "markdown"
+
+    fn = process_search_html if kind == "batch" else process_document_html
+    with PostProcessor(workers=workers) as processor:
+        # Warm up the pool so process start-up is not measured
+        for _ in processor.run(range(max(workers, 1)), capture, fn):
+            pass
+        start = time.perf_counter()
+        for _, future in processor.run(range(pages), capture, fn):
+            future.result()
+        return pages / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--capture-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    worker_counts = [0] + [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus]
+    if cpus not in worker_counts:
+        worker_counts.append(cpus)
+
+    for kind in ("batch", "crawl"):
+        print(f"\n{kind}: {args.pages} pages, {args.capture_ms:g} ms browser time per page")
+        print(f"{'workers':>8} {'pages/s':>10} {'speedup':>8}")
+        baseline = None
+        for workers in worker_counts:
+            rate = run(workers, args.pages, args.capture_ms / 1000, kind)
+            baseline = baseline or rate
+            label = "inline" if workers == 0 else str(workers)
+            print(f"{label:>8} {rate:>10.1f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
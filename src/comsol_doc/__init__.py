@@ -5,7 +5,7 @@ using browser automation.
 """
 
 from .core import ComsolDocSearcher
-from .models import SearchResult, DocumentContent
+from .models import SearchResult, SearchResultSet, DocumentContent
 from .formatters import OutputFormatter
 from .config import DEFAULT_VERSION, DEFAULT_MAX_RESULTS
 
@@ -14,6 +14,7 @@ __version__ = "0.2.0"
 __all__ = [
     "ComsolDocSearcher",
     "SearchResult",
+    "SearchResultSet",
     "DocumentContent",
     "OutputFormatter",
     "search_comsol_docs_advanced",  # Backward compatibility
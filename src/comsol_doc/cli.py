@@ -1,16 +1,25 @@
 """Command-line interface for COMSOL documentation search."""
 
 import typer
+import json
 import re
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from .core import ComsolDocSearcher
 from .formatters import OutputFormatter
+from .snapshot import DocSnapshot, IncrementalUpdater
+from .pipeline import PostProcessor
+from .models import SearchResultSet
+from .expansion import expand_query, load_synonyms
+from .metrics import REGISTRY
+from .logs import LOG_LEVELS, configure_logging
 from .config import DEFAULT_VERSION, DEFAULT_MAX_RESULTS
 
+BATCH_FORMATS = ("jsonl", "binary", "json", "markdown", "plain")
+
 app = typer.Typer(
     name="comsol-search",
     help="Search and retrieve COMSOL Multiphysics documentation using browser automation",
@@ -19,6 +28,52 @@ app = typer.Typer(
 console = Console()
 
 
+@app.callback()
+def main_options(
+    ctx: typer.Context,
+    metrics_file: Optional[Path] = typer.Option(
+        None,
+        "--metrics-file",
+        help="Write metrics here when the command finishes (.json for JSON, otherwise Prometheus text)"
+    ),
+    metrics_port: Optional[int] = typer.Option(
+        None,
+        "--metrics-port",
+        help="Serve /metrics (Prometheus) and /metrics.json on this port while running"
+    ),
+    log_json: bool = typer.Option(
+        False,
+        "--log-json",
+        help="Emit structured JSON logs to stderr (or --log-file)"
+    ),
+    log_file: Optional[Path] = typer.Option(
+        None,
+        "--log-file",
+        help="Write logs to this file instead of stderr"
+    ),
+    log_level: str = typer.Option(
+        "INFO",
+        "--log-level",
+        help=f"Minimum log level when logging is enabled ({', '.join(LOG_LEVELS)})"
+    ),
+):
+    """Search and retrieve COMSOL Multiphysics documentation using browser automation."""
+    if log_level.upper() not in LOG_LEVELS:
+        console.print(f"[red]Error:[/red] Invalid log level '{log_level}'. Choose from: {', '.join(LOG_LEVELS)}")
+        raise typer.Exit(code=1)
+    if log_json or log_file:
+        configure_logging(json_format=log_json, path=log_file, level=log_level)
+    if metrics_port is not None:
+        try:
+            REGISTRY.serve(metrics_port)
+        except OSError as e:
+            console.print(f"[red]Error:[/red] Cannot serve metrics on port {metrics_port}: {e}")
+            raise typer.Exit(code=1)
+        ctx.call_on_close(REGISTRY.stop)
+    if metrics_file:
+        ctx.call_on_close(lambda: REGISTRY.write(metrics_file))
+
+
 @app.command()
 def search(
     term: str = typer.Argument(..., help="Search term or phrase"),
@@ -47,9 +102,27 @@ def search(
         "--output", "-o",
         help="Output file (default: stdout)"
     ),
+    expand: Optional[List[str]] = typer.Option(
+        None,
+        "--expand", "-e",
+        help="Alternative phrasing to search at the same time (repeatable)"
+    ),
+    synonyms: bool = typer.Option(
+        False,
+        "--synonyms", "-s",
+        help="Also search synonyms of the term from the COMSOL synonym table"
+    ),
+    synonyms_file: Optional[Path] = typer.Option(
+        None,
+        "--synonyms-file",
+        help="JSON synonym table (list of term groups) to use with --synonyms"
+    ),
 ):
     """Search COMSOL documentation for a given term.
 
+    With --expand or --synonyms, all phrasings are searched concurrently and
+    the results are merged by URL and ranked by reciprocal-rank fusion.
+
     Examples:
 
         comsol-search search "phase change materials"
@@ -61,19 +134,32 @@ def search(
         comsol-search search "add physics" --module "Application Programming"
 
         comsol-search search "battery" --module "Battery Design,Heat Transfer"
+
+        comsol-search search "battery aging" -e "capacity fade" -e "degradation"
+
+        comsol-search search "battery aging" --synonyms
     """
     searcher = ComsolDocSearcher(version=version, headless=True)
     try:
+        queries = [term]
+        if expand or synonyms or synonyms_file:
+            synonym_table = load_synonyms(synonyms_file) if synonyms or synonyms_file else None
+            queries = expand_query(term, expand or [], synonym_table)
+
         # Show progress
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
         ) as progress:
-            task = progress.add_task(f"Searching COMSOL {version} documentation for '{term}'...", total=None)
+            description = ', '.join(f"'{q}'" for q in queries)
+            task = progress.add_task(f"Searching COMSOL {version} documentation for {description}...", total=None)
 
             # Perform search
-            results = searcher.search(term, max_results=max_results)
+            if len(queries) > 1:
+                results = searcher.search_expanded(queries, max_results=max_results)
+            else:
+                results = searcher.search(term, max_results=max_results)
 
             # Filter by module if specified
             # Note: Module information is in the path, not the module field
@@ -166,6 +252,201 @@ def retrieve(
         searcher.close()
 
 
+@app.command()
+def batch(
+    terms_file: Path = typer.Argument(..., help="File with one search term per line"),
+    output: Path = typer.Option(
+        ...,
+        "--output", "-o",
+        help="Output file"
+    ),
+    version: str = typer.Option(
+        DEFAULT_VERSION,
+        "--version", "-v",
+        help="COMSOL version"
+    ),
+    max_results: int = typer.Option(
+        DEFAULT_MAX_RESULTS,
+        "--max-results", "-n",
+        help="Maximum number of results per term"
+    ),
+    format: str = typer.Option(
+        "jsonl",
+        "--format", "-f",
+        help="Output format: jsonl, binary, json, markdown, plain"
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers", "-w",
+        help="Processes for parsing pages (default: CPU count, 0 to parse inline)"
+    ),
+):
+    """Run many searches, parsing results in parallel while the browser keeps searching.
+
+    jsonl and binary write all results to one file; json, markdown and plain
+    write one formatted section per term.
+
+    Examples:
+
+        comsol-search batch terms.txt --output results.jsonl
+
+        comsol-search batch terms.txt --output results.bin --format binary --workers 4
+
+        comsol-search batch terms.txt --output results.md --format markdown
+    """
+    if format not in BATCH_FORMATS:
+        console.print(
+            f"[red]Error:[/red] Unknown format: {format} (expected one of {', '.join(BATCH_FORMATS)})"
+        )
+        raise typer.Exit(code=1)
+
+    terms = [line.strip() for line in terms_file.read_text().splitlines() if line.strip()]
+    collect = format in ("jsonl", "binary")
+    failures = 0
+
+    searcher = ComsolDocSearcher(version=version, headless=True)
+    processor = PostProcessor(workers=workers)
+    try:
+        result_set = SearchResultSet()
+        sections = []
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            task = progress.add_task(f"Searching COMSOL {version} documentation...", total=None)
+
+            searches = searcher.search_many(
+                terms, processor, max_results=max_results, format=None if collect else format
+            )
+            for i, (term, future) in enumerate(searches, 1):
+                try:
+                    results, formatted = future.result()
+                except Exception as e:
+                    failures += 1
+                    console.print(f"[yellow]![/yellow] '{term}': {e}")
+                    continue
+                if collect:
+                    result_set.extend(results)
+                else:
+                    sections.append(formatted)
+                progress.update(task, description=f"Searched {i}/{len(terms)} terms")
+
+        if format == "jsonl":
+            with output.open("w", encoding="utf-8") as fp:
+                result_set.dump_jsonl(fp)
+        elif format == "binary":
+            output.write_bytes(result_set.to_bytes())
+        else:
+            output.write_text("\n".join(sections))
+
+        if terms and failures == len(terms):
+            console.print(f"[red]Error:[/red] All {len(terms)} searches failed")
+        else:
+            console.print(
+                f"[green]✓[/green] {len(terms) - failures}/{len(terms)} searches saved to {output}"
+            )
+
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        processor.close()
+        searcher.close()
+
+    if terms and failures == len(terms):
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def update(
+    snapshot_dir: Path = typer.Argument(..., help="Snapshot directory (created if missing)"),
+    version: str = typer.Option(
+        DEFAULT_VERSION,
+        "--version", "-v",
+        help="COMSOL version"
+    ),
+    urls: Optional[Path] = typer.Option(
+        None,
+        "--urls", "-u",
+        help="File with one page URL per line (default: read the table of contents)"
+    ),
+    report: Optional[Path] = typer.Option(
+        None,
+        "--report", "-r",
+        help="Write the change report as JSON to this file"
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers", "-w",
+        help="Processes for parsing pages (default: CPU count, 0 to parse inline)"
+    ),
+    prune: bool = typer.Option(
+        False,
+        "--prune",
+        help="Delete pages missing from the listing even if the listing looks incomplete"
+    ),
+):
+    """Create or incrementally update a local snapshot of the documentation.
+
+    Only pages that were added or whose content changed since the last run
+    are re-rendered; pages removed from the documentation are deleted.
+
+    Examples:
+
+        comsol-search update ./docs-6.4
+
+        comsol-search update ./docs-6.4 --report changes.json
+
+        comsol-search update ./docs-6.4 --urls pages.txt
+    """
+    searcher = ComsolDocSearcher(version=version, headless=True)
+    processor = PostProcessor(workers=workers)
+    try:
+        snapshot = DocSnapshot(snapshot_dir, version)
+        page_urls = None
+        if urls:
+            page_urls = [line.strip() for line in urls.read_text().splitlines() if line.strip()]
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            task = progress.add_task(f"Updating COMSOL {version} snapshot...", total=None)
+            change_report = IncrementalUpdater(searcher, snapshot, processor).update(
+                page_urls,
+                progress=lambda message: progress.update(task, description=message),
+                prune=prune,
+            )
+
+        console.print(
+            f"[green]✓[/green] Snapshot updated: "
+            f"{len(change_report.added)} added, {len(change_report.changed)} changed, "
+            f"{len(change_report.removed)} removed, {change_report.unchanged} unchanged "
+            f"({change_report.refetched} pages rendered)"
+        )
+        if change_report.failed:
+            console.print(f"[yellow]![/yellow] {len(change_report.failed)} pages could not be retrieved")
+        if change_report.kept_missing:
+            console.print(
+                f"[yellow]![/yellow] {len(change_report.kept_missing)} pages are missing from the "
+                f"listing but were kept; re-run with --prune to delete them"
+            )
+
+        if report:
+            report.write_text(json.dumps(change_report.to_dict(), indent=2, ensure_ascii=False))
+            console.print(f"[green]✓[/green] Change report saved to {report}")
+
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        processor.close()
+        searcher.close()
+
+
 @app.command()
 def version():
     """Show version information."""
@@ -22,3 +22,36 @@ DEFAULT_MAX_RESULTS = 20
 
 # URL templates
 BASE_URL_TEMPLATE = 'https://doc.comsol.com/{version}/docserver/'
+# Static HTML behind a docserver page ("#!/<path>" -> "doc/<path>")
+STATIC_DOC_URL_TEMPLATE = 'https://doc.comsol.com/{version}/doc/{path}'
+
+# Table of contents / incremental update
+TOC_LINK_SELECTOR = 'a[href^="#!/"]'  # Links to documentation pages in the TOC tree
+# Lazily loaded TOC tree nodes whose children have not been expanded yet
+TOC_COLLAPSED_SELECTOR = '.v-tree-node:not(.v-tree-node-expanded):not(.v-tree-node-leaf)'
+TOC_EXPANDER_POSITION = {'x': 6, 'y': 8}  # Click offset of a node's expand arrow
+TOC_LOAD_TIMEOUT = 30000  # Milliseconds to wait for the TOC to appear
+TOC_EXPAND_TIMEOUT = 30000  # Milliseconds to wait for expanded nodes to load
+TOC_MAX_DEPTH = 30  # Expansion rounds (tree levels) before giving up
+FINGERPRINT_TIMEOUT = 30  # Seconds per static page request
+FINGERPRINT_WORKERS = 16  # Concurrent static page requests
+SNAPSHOT_CHECKPOINT_INTERVAL = 50  # Save the manifest after this many rendered pages
+PRUNE_MAX_FRACTION = 0.1  # Largest share of the snapshot removed without --prune
+
+# Query expansion
+RRF_K = 60  # Reciprocal-rank fusion constant: score = sum(1 / (RRF_K + rank))
+MAX_EXPANSIONS = 4  # Maximum sub-queries per expanded search (including the original)
+
+# Groups of interchangeable COMSOL terms used by `search --synonyms`
+DEFAULT_SYNONYMS = [
+    ['battery aging', 'capacity fade', 'battery degradation'],
+    ['discharge rate', 'c-rate', 'charge rate'],
+    ['phase change', 'melting', 'solidification'],
+    ['turbulent flow', 'turbulence model', 'rans'],
+    ['eigenfrequency', 'modal analysis', 'natural frequency'],
+    ['porous media', 'porous medium', 'darcy flow'],
+    ['impedance spectroscopy', 'electrochemical impedance', 'eis'],
+    ['model object', 'model api', 'java api'],
+    ['mesh', 'meshing', 'mesh refinement'],
+    ['contact resistance', 'thermal contact', 'interface resistance'],
+]
@@ -1,9 +1,17 @@
 """Core browser automation logic for COMSOL documentation search."""
 
 from playwright.sync_api import sync_playwright, Page
-from typing import List
+from concurrent.futures import Future
+from typing import Iterable, Iterator, List, Optional, Tuple
+import hashlib
+import http.client
+import urllib.request
 
 from .models import SearchResult, DocumentContent
+from .parsing import build_document, build_search_results
+from .expansion import fuse_results
+from .pipeline import PostProcessor, process_search_html, process_document_html
+from .metrics import BROWSERS_ALIVE, OPERATION_ERRORS, PAGES_OPEN, track
 from .config import (
     SEARCH_INPUT_SELECTOR,
     SEARCH_RESULTS_SELECTOR,
@@ -18,8 +26,40 @@ from .config import (
     DEFAULT_VERSION,
     DEFAULT_MAX_RESULTS,
     BASE_URL_TEMPLATE,
+    STATIC_DOC_URL_TEMPLATE,
+    TOC_LINK_SELECTOR,
+    TOC_COLLAPSED_SELECTOR,
+    TOC_EXPANDER_POSITION,
+    TOC_LOAD_TIMEOUT,
+    TOC_EXPAND_TIMEOUT,
+    TOC_MAX_DEPTH,
+    FINGERPRINT_TIMEOUT,
 )
 
+# Read the browser's innerText of every matched element in one round trip
+_INNER_TEXTS_JS = 'elements => elements.map(e => e.innerText)'
+_LINKS_JS = 'links => links.map(a => [a.innerText, a.getAttribute("href")])'
+_PATH_TEXTS_JS = (
+    '(containers, selector) => containers.map('
+    'c => Array.from(c.querySelectorAll(selector), e => e.innerText))'
+)
+
+# Before capturing HTML for offline parsing, drop what innerText would skip
+# but the markup cannot show: nodes hidden by CSS classes or stylesheets
+_STRIP_HIDDEN_JS = """() => {
+    for (const element of Array.from(document.querySelectorAll('body *'))) {
+        if (!element.isConnected) continue;
+        const style = getComputedStyle(element);
+        if (style.display === 'none') {
+            element.remove();
+        } else if (style.visibility === 'hidden') {
+            for (const node of Array.from(element.childNodes)) {
+                if (node.nodeType === Node.TEXT_NODE) node.remove();
+            }
+        }
+    }
+}"""
+
 
 class ComsolDocSearcher:
     """Handles browser automation for COMSOL documentation search and retrieval."""
@@ -39,15 +79,31 @@ class ComsolDocSearcher:
 
     def start_browser(self):
         """Starts the browser instance."""
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=self.headless)
+        with track('start_browser'):
+            self.playwright = sync_playwright().start()
+            self.browser = self.playwright.chromium.launch(headless=self.headless)
+        BROWSERS_ALIVE.inc()
 
     def close(self):
         """Closes the browser instance."""
         if self.browser:
             self.browser.close()
+            self.browser = None
+            BROWSERS_ALIVE.dec()
         if self.playwright:
             self.playwright.stop()
+            self.playwright = None
+
+    def _new_page(self) -> Page:
+        """Open a browser page, keeping the open-page gauge current."""
+        page = self.browser.new_page()
+        PAGES_OPEN.inc()
+        return page
+
+    def _close_page(self, page: Page):
+        """Close a page opened with _new_page."""
+        page.close()
+        PAGES_OPEN.dec()
 
     def search(self, search_term: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[SearchResult]:
         """Search COMSOL documentation for a given term.
@@ -65,155 +121,122 @@ class ComsolDocSearcher:
         if not self.browser:
             self.start_browser()
 
-        results = []
-        page = self.browser.new_page()
+        page = self._new_page()
+
+        try:
+            with track('search', search_term=search_term):
+                if not self._open_search(page, search_term):
+                    return []
+                return build_search_results(
+                    *self._read_search(page), search_term, self.version, self.base_url, max_results
+                )
+
+        except Exception as e:
+            raise Exception(f"Error during search: {e}") from e
+
+        finally:
+            self._close_page(page)
+
+    def search_concurrent(
+        self,
+        search_terms: List[str],
+        max_results: int = DEFAULT_MAX_RESULTS,
+    ) -> List[List[SearchResult]]:
+        """Run several searches at once in one browser session.
+
+        Each term gets its own page. All pages start loading before any is
+        waited on, and all queries are submitted before any results are read,
+        so the server handles the searches concurrently and the total wall
+        time is close to that of a single search. A sub-query that fails or
+        times out yields an empty list instead of failing the whole call.
+
+        Args:
+            search_terms: Terms to search for
+            max_results: Maximum number of results per term
+
+        Returns:
+            One list of SearchResult objects per term, in input order
+
+        Raises:
+            Exception: If every sub-query fails
+        """
+        if not self.browser:
+            self.start_browser()
+
+        pages = []
+        errors: List[Optional[Exception]] = [None] * len(search_terms)
+        results: List[List[SearchResult]] = [[] for _ in search_terms]
+
+        def attempt(i, action, *args, **kwargs):
+            # A failing sub-query is dropped; the others still count
+            if errors[i] is None:
+                try:
+                    action(*args, **kwargs)
+                except Exception as e:
+                    errors[i] = e
+                    OPERATION_ERRORS.inc(operation='search_subquery', type=type(e).__name__)
 
         try:
-            # Navigate to documentation
-            page.goto(self.base_url, wait_until='domcontentloaded', timeout=PAGE_LOAD_TIMEOUT)
-
-            # Wait for search box to be available
-            search_box = page.wait_for_selector(SEARCH_INPUT_SELECTOR, timeout=SEARCH_BOX_TIMEOUT)
-
-            if search_box:
-                search_box.fill(search_term)
-                search_box.press('Enter')
-
-                # Wait for results to load
-                page.wait_for_selector(SEARCH_RESULTS_SELECTOR)
-
-                # Extract results - get all path containers, links, and snippets
-                path_containers = page.query_selector_all('.searchResultsPath')
-                link_buttons = page.query_selector_all(SEARCH_RESULTS_LINK_SELECTOR)
-                snippet_elems = page.query_selector_all(SEARCH_HIT_SELECTOR)
-
-                # Each result is a triplet: link, path, snippet
-                # They appear in order in the DOM
-                for i, link_button in enumerate(link_buttons):
-                    if len(results) >= max_results:
-                        break
-
-                    title = link_button.inner_text().strip()
-
-                    # Get path for THIS specific result
-                    path_parts = []
-                    module = "Unknown"
-                    if i < len(path_containers):
-                        path_elements = path_containers[i].query_selector_all(SEARCH_RESULTS_PATH_SELECTOR)
-                        path_parts = [
-                            p.inner_text().strip()
-                            for p in path_elements
-                            if p.inner_text().strip() and '>' not in p.inner_text()
-                        ]
-                        # Extract module from path - it's typically after the first segment
-                        # Path format: "COMSOL Multiphysics > Release Notes > Battery Design Module > ..."
-                        # or: "COMSOL Multiphysics > Reference Manual > ..."
-                        # Module-specific content often appears in later path segments
-
-                        # Join full path for context checking
-                        full_path_lower = ' > '.join(path_parts).lower()
-
-                        # Strategy 1: Look for explicit module/guide names in path segments
-                        if len(path_parts) > 1:
-                            for part in path_parts:
-                                part_lower = part.lower()
-                                # Expanded keyword list for module detection
-                                if any(keyword in part_lower for keyword in [
-                                    # Modules (with "Module" in name)
-                                    'battery design module', 'cfd module', 'heat transfer module',
-                                    'structural mechanics module', 'acoustics module',
-                                    'chemical reaction engineering module', 'corrosion module',
-                                    'electrochemistry module', 'electrodeposition module',
-                                    'fuel cell', 'electrolyzer module', 'microfluidics module',
-                                    'optimization module', 'plasma module', 'pipe flow module',
-                                    'porous media flow module', 'polymer flow module',
-                                    'subsurface flow module', 'electric discharge module',
-                                    # Guides and special sections
-                                    'application programming', 'programming guide', 'physics builder',
-                                    'model manager', 'material library',
-                                    # Keywords that indicate module-specific content
-                                    'module', 'battery', 'cfd', 'plasma', 'api'
-                                ]):
-                                    module = part
-                                    break
-
-                        # Strategy 2: Special handling for API/Programming documentation
-                        if module == "Unknown":
-                            # Check if path contains programming/API indicators
-                            api_indicators = ['programming', 'java', 'api', 'method', 'script']
-                            if any(indicator in full_path_lower for indicator in api_indicators):
-                                # Look for "Application Programming Guide" or "Model Manager API" specifically
-                                for part in path_parts:
-                                    if 'programming' in part.lower() or 'api' in part.lower():
-                                        module = part
-                                        break
-
-                        # Strategy 3: Detect guides/manuals (prefer specific over generic)
-                        if module == "Unknown" and len(path_parts) > 1:
-                            for part in path_parts:
-                                part_lower = part.lower()
-                                # Prefer specific guides
-                                if part_lower in ['physics builder manual', 'application programming guide',
-                                                   'model manager reference manual', 'introduction to the application builder']:
-                                    module = part
-                                    break
-
-                        # Strategy 4: Use second path segment (usually the manual/guide name)
-                        # Skip generic "COMSOL Multiphysics" and get the next meaningful segment
-                        if module == "Unknown" and len(path_parts) > 1:
-                            for i, part in enumerate(path_parts):
-                                if part.strip() and part != "COMSOL Multiphysics":
-                                    module = part
-                                    break
-
-                    # Clean and truncate path to avoid token overflow
-                    path = ' > '.join(path_parts)
-                    # Remove duplicate consecutive segments
-                    path_segments = path.split(' > ')
-                    cleaned_segments = []
-                    last_segment = None
-                    for seg in path_segments:
-                        if seg != last_segment:
-                            cleaned_segments.append(seg)
-                            last_segment = seg
-                    path = ' > '.join(cleaned_segments)
-
-                    # Truncate path if still too long (max 500 chars)
-                    if len(path) > 500:
-                        # Take last 450 chars and add ellipsis
-                        path = '...' + path[-450:]
-
-                    # Get snippet for THIS specific result
-                    snippet = ""
-                    if i < len(snippet_elems):
-                        snippet = snippet_elems[i].inner_text().strip()
-
-                    # Truncate long snippets (increased from 200 to 400)
-                    if len(snippet) > 400:
-                        snippet = snippet[:400] + '...'
-
-                    # Get the relative URL from the link's href attribute
-                    href = link_button.get_attribute('href')
-                    url = f"{self.base_url}{href}" if href else None
-
-                    result = SearchResult(
-                        module=module,
-                        title=title,
-                        path=path,
-                        snippet=snippet,
-                        search_term=search_term,
-                        version=self.version,
-                        url=url,
+            with track('search_concurrent', search_terms=search_terms):
+                for _ in search_terms:
+                    pages.append(self._new_page())
+
+                # Start every navigation without waiting for the page to load
+                for i, page in enumerate(pages):
+                    attempt(i, page.goto, self.base_url, wait_until='commit', timeout=PAGE_LOAD_TIMEOUT)
+
+                # Submit every query before reading any results
+                submitted = [False] * len(pages)
+
+                def submit(i, page, search_term):
+                    search_box = page.wait_for_selector(SEARCH_INPUT_SELECTOR, timeout=SEARCH_BOX_TIMEOUT)
+                    if search_box:
+                        search_box.fill(search_term)
+                        search_box.press('Enter')
+                        submitted[i] = True
+
+                for i, (page, search_term) in enumerate(zip(pages, search_terms)):
+                    attempt(i, submit, i, page, search_term)
+
+                def collect(i, page, search_term):
+                    page.wait_for_selector(SEARCH_RESULTS_SELECTOR)
+                    results[i] = build_search_results(
+                        *self._read_search(page), search_term, self.version, self.base_url, max_results
                     )
-                    results.append(result)
+
+                for i, (page, search_term) in enumerate(zip(pages, search_terms)):
+                    if submitted[i]:
+                        attempt(i, collect, i, page, search_term)
+
+                if search_terms and all(errors):
+                    raise errors[0]
+                return results
 
         except Exception as e:
             raise Exception(f"Error during search: {e}") from e
 
         finally:
-            page.close()
+            for page in pages:
+                self._close_page(page)
 
-        return results
+    def search_expanded(
+        self,
+        search_terms: List[str],
+        max_results: int = DEFAULT_MAX_RESULTS,
+    ) -> List[SearchResult]:
+        """Search several phrasings of a query and merge the results.
+
+        Args:
+            search_terms: Sub-queries (see expansion.expand_query)
+            max_results: Maximum number of results per sub-query and overall
+
+        Returns:
+            De-duplicated results ranked by reciprocal-rank fusion
+
+        Raises:
+            Exception: If browser automation fails
+        """
+        return fuse_results(self.search_concurrent(search_terms, max_results), max_results)
 
     def retrieve_content(self, url: str) -> DocumentContent:
         """Retrieve full content from a COMSOL documentation URL.
@@ -230,49 +253,234 @@ class ComsolDocSearcher:
         if not self.browser:
             self.start_browser()
 
-        page = self.browser.new_page()
+        page = self._new_page()
 
         try:
-            # Navigate to the specific documentation page
-            page.goto(url, timeout=PAGE_LOAD_TIMEOUT)
-
-            # Wait for content to load (SPA navigation)
-            page.wait_for_selector('.v-panel-content')
-
-            # Get page title
-            title = page.title()
-
-            # Extract breadcrumb if available
-            breadcrumb_elements = page.query_selector_all(SEARCH_RESULTS_PATH_SELECTOR)
-            breadcrumb = [elem.inner_text().strip() for elem in breadcrumb_elements if elem.inner_text().strip()]
-
-            # Get main content
-            # COMSOL uses various content containers, try to get the main text
-            body = page.query_selector('body')
-            content = body.inner_text() if body else ""
-
-            # Look for specific content sections
-            # You could refine this to get only the main documentation content
-            content_sections = page.query_selector_all('.v-panel-content')
-            if content_sections:
-                # Combine content from all panels
-                content_parts = []
-                for section in content_sections:
-                    text = section.inner_text().strip()
-                    if text and len(text) > 50:  # Filter out empty or very short sections
-                        content_parts.append(text)
-                if content_parts:
-                    content = '\n\n'.join(content_parts)
-
-            return DocumentContent(
-                url=url,
-                title=title,
-                content=content,
-                breadcrumb=breadcrumb
-            )
+            with track('retrieve', url=url):
+                self._open_document(page, url)
+                return build_document(url, page.title(), *self._read_document(page))
 
         except Exception as e:
             raise Exception(f"Error retrieving content from {url}: {e}") from e
 
         finally:
-            page.close()
+            self._close_page(page)
+
+    def search_many(
+        self,
+        search_terms: Iterable[str],
+        processor: PostProcessor,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        format: Optional[str] = None,
+    ) -> Iterator[Tuple[str, 'Future[Tuple[List[SearchResult], Optional[str]]]']]:
+        """Search for several terms, post-processing results in parallel.
+
+        The browser captures each results page and hands its HTML to the
+        processor, then moves straight on to the next term.
+
+        Args:
+            search_terms: Terms to search for
+            processor: PostProcessor that parses (and formats) captured pages
+            max_results: Maximum number of results per term
+            format: Optional output format applied in the workers
+
+        Yields:
+            (search_term, future) pairs in input order; future.result() is a
+            (results, formatted output or None) tuple
+        """
+        if not self.browser:
+            self.start_browser()
+
+        def capture(search_term):
+            page = self._new_page()
+            try:
+                with track('search_capture', search_term=search_term):
+                    html = self._capture_search(page, search_term) or ''
+            except Exception as e:
+                raise Exception(f"Error during search: {e}") from e
+            finally:
+                self._close_page(page)
+            return html, search_term, self.version, self.base_url, max_results, format
+
+        return processor.run(search_terms, capture, process_search_html)
+
+    def retrieve_many(
+        self,
+        urls: Iterable[str],
+        processor: PostProcessor,
+        format: Optional[str] = None,
+    ) -> Iterator[Tuple[str, 'Future[Tuple[DocumentContent, Optional[str]]]']]:
+        """Retrieve several pages, post-processing content in parallel.
+
+        Args:
+            urls: Full URLs of the documentation pages
+            processor: PostProcessor that parses (and formats) captured pages
+            format: Optional output format applied in the workers
+
+        Yields:
+            (url, future) pairs in input order; future.result() is a
+            (document, formatted output or None) tuple
+        """
+        if not self.browser:
+            self.start_browser()
+
+        def capture(url):
+            page = self._new_page()
+            try:
+                with track('retrieve_capture', url=url):
+                    html, title = self._capture_document(page, url)
+            except Exception as e:
+                raise Exception(f"Error retrieving content from {url}: {e}") from e
+            finally:
+                self._close_page(page)
+            return html, url, title, format
+
+        return processor.run(urls, capture, process_document_html)
+
+    def _open_search(self, page: Page, search_term: str) -> bool:
+        """Run a search in the page and wait for the results.
+
+        Returns:
+            False if the search box did not appear
+        """
+        # Navigate to documentation
+        page.goto(self.base_url, wait_until='domcontentloaded', timeout=PAGE_LOAD_TIMEOUT)
+
+        # Wait for search box to be available
+        search_box = page.wait_for_selector(SEARCH_INPUT_SELECTOR, timeout=SEARCH_BOX_TIMEOUT)
+        if not search_box:
+            return False
+
+        search_box.fill(search_term)
+        search_box.press('Enter')
+
+        # Wait for results to load
+        page.wait_for_selector(SEARCH_RESULTS_SELECTOR)
+        return True
+
+    def _read_search(self, page: Page) -> Tuple[list, list, list]:
+        """Read result links, breadcrumb texts and snippets with the browser's innerText."""
+        links = page.eval_on_selector_all(SEARCH_RESULTS_LINK_SELECTOR, _LINKS_JS)
+        path_texts = page.eval_on_selector_all(
+            '.searchResultsPath', _PATH_TEXTS_JS, SEARCH_RESULTS_PATH_SELECTOR
+        )
+        snippets = page.eval_on_selector_all(SEARCH_HIT_SELECTOR, _INNER_TEXTS_JS)
+        return links, path_texts, snippets
+
+    def _capture_search(self, page: Page, search_term: str) -> Optional[str]:
+        """Run a search in the page and return the rendered results HTML.
+
+        Returns:
+            Page HTML, or None if the search box did not appear
+        """
+        if not self._open_search(page, search_term):
+            return None
+        page.evaluate(_STRIP_HIDDEN_JS)
+        return page.content()
+
+    def _open_document(self, page: Page, url: str):
+        """Load a documentation page and wait for its content."""
+        # Navigate to the specific documentation page
+        page.goto(url, timeout=PAGE_LOAD_TIMEOUT)
+
+        # Wait for content to load (SPA navigation)
+        page.wait_for_selector('.v-panel-content')
+
+    def _read_document(self, page: Page) -> Tuple[List[str], str, List[str]]:
+        """Read breadcrumb, body and panel texts with the browser's innerText."""
+        breadcrumb_texts = page.eval_on_selector_all(SEARCH_RESULTS_PATH_SELECTOR, _INNER_TEXTS_JS)
+        body_text = page.eval_on_selector_all('body', _INNER_TEXTS_JS)
+        panel_texts = page.eval_on_selector_all('.v-panel-content', _INNER_TEXTS_JS)
+        return breadcrumb_texts, body_text[0] if body_text else "", panel_texts
+
+    def _capture_document(self, page: Page, url: str) -> Tuple[str, str]:
+        """Load a documentation page and return its rendered HTML and title."""
+        self._open_document(page, url)
+        page.evaluate(_STRIP_HIDDEN_JS)
+        return page.content(), page.title()
+
+    def list_pages(self) -> List[str]:
+        """List documentation page URLs from the docserver table of contents.
+
+        The table of contents is a lazily loaded tree, so every collapsed
+        node is expanded first; otherwise pages below collapsed nodes would
+        be missing from the listing.
+
+        Returns:
+            Unique page URLs in table-of-contents order
+
+        Raises:
+            Exception: If browser automation fails
+        """
+        if not self.browser:
+            self.start_browser()
+
+        page = self._new_page()
+
+        try:
+            with track('list_pages'):
+                page.goto(self.base_url, wait_until='domcontentloaded', timeout=PAGE_LOAD_TIMEOUT)
+                page.wait_for_selector(TOC_LINK_SELECTOR, timeout=TOC_LOAD_TIMEOUT)
+                self._expand_toc(page)
+
+                urls = []
+                seen = set()
+                for link in page.query_selector_all(TOC_LINK_SELECTOR):
+                    href = link.get_attribute('href')
+                    if not href or not href.startswith('#!/'):
+                        continue
+                    # Drop in-page anchors so each page is listed once
+                    url = f"{self.base_url}#!/{href[3:].split('#')[0]}"
+                    if url not in seen:
+                        seen.add(url)
+                        urls.append(url)
+                return urls
+
+        except Exception as e:
+            raise Exception(f"Error listing documentation pages: {e}") from e
+
+        finally:
+            self._close_page(page)
+
+    def _expand_toc(self, page: Page):
+        """Expand every node of the table-of-contents tree, one level per round.
+
+        Raises:
+            Exception: If nodes are still collapsed after TOC_MAX_DEPTH rounds
+        """
+        for _ in range(TOC_MAX_DEPTH):
+            collapsed = page.query_selector_all(TOC_COLLAPSED_SELECTOR)
+            if not collapsed:
+                return
+            for node in collapsed:
+                # Click the arrow, not the caption, which would open the page
+                node.click(position=TOC_EXPANDER_POSITION)
+            # Children are fetched from the server after each click
+            page.wait_for_load_state('networkidle', timeout=TOC_EXPAND_TIMEOUT)
+        if page.query_selector_all(TOC_COLLAPSED_SELECTOR):
+            raise Exception(f"Table of contents still has collapsed nodes after {TOC_MAX_DEPTH} levels")
+
+    def fetch_fingerprint(self, url: str) -> Optional[str]:
+        """Hash the static HTML behind a docserver page without rendering it.
+
+        Docserver pages are thin wrappers around static HTML files, which can
+        be fetched with a plain HTTP request. Comparing their hashes is far
+        cheaper than re-rendering every page through the browser.
+
+        Args:
+            url: Docserver URL of the page (".../docserver/#!/<path>")
+
+        Returns:
+            SHA-256 hex digest of the static HTML, or None if the page has no
+            static counterpart or it could not be fetched
+        """
+        _, sep, path = url.partition('#!/')
+        if not sep:
+            return None
+        static_url = STATIC_DOC_URL_TEMPLATE.format(version=self.version, path=path.split('#')[0])
+        try:
+            with track('fingerprint', url=url):
+                with urllib.request.urlopen(static_url, timeout=FINGERPRINT_TIMEOUT) as response:
+                    return hashlib.sha256(response.read()).hexdigest()
+        except (OSError, http.client.HTTPException, ValueError):
+            return None
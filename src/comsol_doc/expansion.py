@@ -0,0 +1,119 @@
+"""Query expansion and rank fusion for multi-variant searches."""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import json
+import re
+
+from .models import SearchResult
+from .config import DEFAULT_SYNONYMS, MAX_EXPANSIONS, RRF_K
+
+
+def load_synonyms(path: Optional[Path] = None) -> List[List[str]]:
+    """Load a synonym table.
+
+    The file is JSON: a list of groups, each a list of interchangeable terms,
+    e.g. ``[["battery aging", "capacity fade", "degradation"]]``.
+
+    Args:
+        path: Synonym file (default: built-in COMSOL table)
+
+    Returns:
+        List of synonym groups (lower-cased)
+
+    Raises:
+        ValueError: If the file is not a list of string lists
+    """
+    groups = DEFAULT_SYNONYMS
+    if path is not None:
+        groups = json.loads(Path(path).read_text(encoding='utf-8'))
+        if not isinstance(groups, list) or not all(
+            isinstance(group, list) and all(isinstance(term, str) for term in group)
+            for group in groups
+        ):
+            raise ValueError(f"Synonym file {path} must contain a list of lists of strings")
+    return [[term.lower() for term in group] for group in groups]
+
+
+def expand_query(
+    search_term: str,
+    variants: Iterable[str] = (),
+    synonyms: Optional[List[List[str]]] = None,
+    max_queries: int = MAX_EXPANSIONS,
+) -> List[str]:
+    """Build the list of sub-queries for an expanded search.
+
+    Explicit variants come first and are always kept. Synonym variants are
+    made by swapping a whole-word phrase of the search term that appears in a
+    synonym group (the longest one, if several match) for the other members
+    of that group; they only fill the remaining slots up to max_queries.
+
+    Args:
+        search_term: The original search term (always the first sub-query)
+        variants: Additional phrasings supplied by the caller
+        synonyms: Synonym groups to expand with, or None to skip
+        max_queries: Maximum number of sub-queries once synonyms are added
+
+    Returns:
+        De-duplicated sub-queries, original term first
+    """
+    queries: List[str] = []
+    seen = set()
+
+    def add(query: str):
+        key = ' '.join(query.lower().split())
+        if key and key not in seen:
+            seen.add(key)
+            queries.append(query.strip())
+
+    for query in (search_term, *variants):
+        add(query)
+
+    if synonyms:
+        term_lower = search_term.lower()
+        for group in synonyms:
+            for phrase in sorted(group, key=len, reverse=True):
+                pattern = re.compile(r'\b' + re.escape(phrase) + r'\b')
+                if pattern.search(term_lower):
+                    for other in group:
+                        if len(queries) >= max_queries:
+                            return queries
+                        if other != phrase:
+                            add(pattern.sub(lambda _, other=other: other, term_lower))
+                    break
+
+    return queries
+
+
+def fuse_results(
+    result_lists: Sequence[List[SearchResult]],
+    max_results: int,
+    k: int = RRF_K,
+) -> List[SearchResult]:
+    """Merge ranked result lists with reciprocal-rank fusion.
+
+    Results are de-duplicated by URL (or title and path when there is no URL).
+    Each result scores sum(1 / (k + rank)) over the lists it appears in, so
+    pages found by several phrasings rise to the top. The entry kept for a
+    duplicate is the one from its best-ranked occurrence.
+
+    Args:
+        result_lists: One ranked list per sub-query
+        max_results: Maximum number of results to return
+        k: Fusion constant; larger values flatten the rank weighting
+
+    Returns:
+        Fused list of SearchResult objects, best first
+    """
+    scores: Dict[Tuple, float] = {}
+    best: Dict[Tuple, Tuple[int, SearchResult]] = {}
+
+    for results in result_lists:
+        for rank, result in enumerate(results, 1):
+            key = (result.url,) if result.url else (None, result.title, result.path)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            if key not in best or rank < best[key][0]:
+                best[key] = (rank, result)
+
+    ordered = sorted(scores, key=lambda key: (-scores[key], best[key][0]))
+    return [best[key][1] for key in ordered[:max_results]]
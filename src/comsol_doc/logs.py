@@ -0,0 +1,72 @@
+"""Structured (JSON lines) logging for the comsol_doc package."""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import json
+import logging
+import sys
+
+# Level names accepted by configure_logging
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+# Handler installed by the last configure_logging() call
+_handler: Optional[logging.Handler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats log records as one JSON object per line.
+
+    Standard fields are ``ts``, ``level``, ``logger`` and ``message``; any
+    fields passed with ``extra=`` are included as top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(json_format: bool = True, path: Optional[Path] = None, level: str = 'INFO'):
+    """Send package logs to stderr or a file.
+
+    Calling it again replaces the handler installed by the previous call.
+
+    Args:
+        json_format: Emit JSON lines instead of plain text
+        path: Log file (default: stderr)
+        level: Minimum level name, one of LOG_LEVELS (case-insensitive)
+
+    Raises:
+        ValueError: If level is not a known level name
+    """
+    if level.upper() not in LOG_LEVELS:
+        raise ValueError(f"Invalid log level '{level}'. Choose from: {', '.join(LOG_LEVELS)}")
+
+    handler = logging.FileHandler(path, encoding='utf-8') if path else logging.StreamHandler(sys.stderr)
+    handler.setFormatter(
+        JsonFormatter() if json_format
+        else logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s')
+    )
+
+    global _handler
+    package_logger = logging.getLogger('comsol_doc')
+    if _handler is not None:
+        package_logger.removeHandler(_handler)
+        _handler.close()
+    _handler = handler
+    package_logger.setLevel(level.upper())
+    package_logger.addHandler(handler)
+    package_logger.propagate = False
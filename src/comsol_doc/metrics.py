@@ -0,0 +1,388 @@
+"""Operational metrics for long-running and batch use.
+
+A small in-process registry of counters, gauges and latency histograms that
+can be rendered as Prometheus text or JSON, served over HTTP, or written to a
+file at the end of a CLI run.
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds; docserver operations take from ~1 s to a minute
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ''
+    escaped = (
+        (name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in key
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric(ABC):
+    """Base class for labelled metrics."""
+
+    type = ''
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        """Return (sample name, labels, value) triples for rendering."""
+
+    @abstractmethod
+    def to_dict(self) -> dict:
+        """Convert to a JSON-friendly dictionary."""
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, optionally split by labels."""
+
+    type = 'counter'
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Increase the counter for the given labels."""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Return the current value for the given labels."""
+        return self._values.get(_label_key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+    def to_dict(self):
+        return {
+            'type': self.type,
+            'help': self.help,
+            'samples': [{'labels': dict(key), 'value': value} for _, key, value in self.samples()],
+        }
+
+
+class Gauge(Counter):
+    """A value that can go up and down, or be read from a callback."""
+
+    type = 'gauge'
+
+    def __init__(self, name: str, help: str, callback: Optional[Callable[[], Optional[float]]] = None):
+        super().__init__(name, help)
+        self._callback = callback
+
+    def set(self, value: float, **labels):
+        """Set the gauge for the given labels."""
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels):
+        """Decrease the gauge for the given labels."""
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        if self._callback:
+            value = self._callback()
+            return [] if value is None else [(self.name, (), value)]
+        return super().samples()
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (e.g. latencies) in cumulative buckets."""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (per-bucket counts incl. +Inf, sum, count)
+        self._values: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels):
+        """Record one observation for the given labels."""
+        key = _label_key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def _snapshot(self):
+        with self._lock:
+            return [(key, list(counts), total, count) for key, (counts, total, count) in self._values.items()]
+
+    def samples(self):
+        samples = []
+        for key, counts, total, count in self._snapshot():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += bucket_count
+                le = bound if bound == '+Inf' else _format_value(bound)
+                samples.append((f'{self.name}_bucket', key + (('le', le),), cumulative))
+            samples.append((f'{self.name}_sum', key, total))
+            samples.append((f'{self.name}_count', key, count))
+        return samples
+
+    def to_dict(self):
+        samples = []
+        for key, counts, total, count in self._snapshot():
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += bucket_count
+                buckets[str(bound)] = cumulative
+            samples.append({
+                'labels': dict(key),
+                'buckets': buckets,
+                'sum': total,
+                'count': count,
+                'mean': total / count if count else None,
+            })
+        return {'type': self.type, 'help': self.help, 'samples': samples}
+
+
+class MetricsRegistry:
+    """Holds named metrics and renders them for export."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} already registered as {existing.type}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter(name, help))
+
+    def gauge(self, name: str, help: str, callback: Optional[Callable[[], Optional[float]]] = None) -> Gauge:
+        """Get or create a gauge (optionally computed by callback at export time)."""
+        return self._register(Gauge(name, help, callback))
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram(name, help, buckets))
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for sample_name, key, value in metric.samples():
+                lines.append(f'{sample_name}{_format_labels(key)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self) -> dict:
+        """Convert all metrics to a JSON-friendly dictionary."""
+        return {
+            'timestamp': time.time(),
+            'metrics': {name: metric.to_dict() for name, metric in list(self._metrics.items())},
+        }
+
+    def write(self, path: Path):
+        """Write metrics to a file: JSON for *.json, Prometheus text otherwise."""
+        path = Path(path)
+        if path.suffix == '.json':
+            path.write_text(json.dumps(self.to_dict(), indent=2))
+        else:
+            path.write_text(self.render_prometheus())
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """Serve metrics over HTTP from a background thread.
+
+        ``/metrics`` returns Prometheus text and ``/metrics.json`` returns JSON.
+
+        Args:
+            port: TCP port (0 picks a free port)
+            host: Interface to bind
+
+        Returns:
+            The running server
+
+        Raises:
+            OSError: If the address cannot be bound (e.g. the port is in use)
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body = registry.render_prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path == '/metrics.json':
+                    body = json.dumps(registry.to_dict()).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(
+            "metrics endpoint started",
+            extra={'host': host, 'port': self._server.server_address[1]},
+        )
+        return self._server
+
+    def stop(self):
+        """Stop the HTTP server started by serve()."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def chromium_rss_bytes() -> Optional[float]:
+    """Total resident memory of Chromium processes started by this process.
+
+    Walks /proc for descendants of the current process, so it is only
+    available on Linux.
+
+    Returns:
+        RSS in bytes, or None if /proc is not available
+    """
+    proc = Path('/proc')
+    if not proc.is_dir():
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / 'stat').read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields resume after ')'
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    total = 0
+    stack = list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            status = (proc / str(pid) / 'status').read_text()
+        except OSError:
+            continue
+        fields = dict(line.split(':', 1) for line in status.splitlines() if ':' in line)
+        if 'chrom' in fields.get('Name', '').lower() or 'headless' in fields.get('Name', '').lower():
+            rss = fields.get('VmRSS', '').split()
+            if rss:
+                total += int(rss[0]) * 1024  # Reported in kB
+    return total
+
+
+REGISTRY = MetricsRegistry()
+
+BROWSERS_ALIVE = REGISTRY.gauge('comsol_browsers_alive', 'Browser instances currently running')
+PAGES_OPEN = REGISTRY.gauge('comsol_pages_open', 'Browser pages currently open')
+OPERATION_SECONDS = REGISTRY.histogram(
+    'comsol_operation_seconds', 'Duration of browser operations by operation'
+)
+OPERATION_ERRORS = REGISTRY.counter(
+    'comsol_operation_errors_total', 'Failed browser operations by operation and error type'
+)
+POSTPROCESS_PENDING = REGISTRY.gauge(
+    'comsol_postprocess_pending', 'Captured pages waiting for or in post-processing'
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    'comsol_snapshot_cache_requests_total', 'Snapshot pages reused (hit) or re-rendered (miss)'
+)
+CHROMIUM_RSS = REGISTRY.gauge(
+    'comsol_chromium_rss_bytes', 'Resident memory of Chromium processes', callback=chromium_rss_bytes
+)
+
+
+def cache_hit_ratio() -> Optional[float]:
+    """Fraction of snapshot pages served from the snapshot, or None before any update."""
+    hits = CACHE_REQUESTS.value(result='hit')
+    total = hits + CACHE_REQUESTS.value(result='miss')
+    return hits / total if total else None
+
+
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    'comsol_snapshot_cache_hit_ratio', 'Fraction of snapshot pages reused without re-rendering',
+    callback=cache_hit_ratio,
+)
+
+
+@contextmanager
+def track(operation: str, **context) -> Iterator[None]:
+    """Time an operation, count its failures and log the outcome.
+
+    Args:
+        operation: Operation name used as the metric label (e.g. "search")
+        **context: Extra fields for the structured log record (not metric labels)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        duration = time.perf_counter() - start
+        OPERATION_SECONDS.observe(duration, operation=operation)
+        OPERATION_ERRORS.inc(operation=operation, type=type(e).__name__)
+        logger.warning(
+            "%s failed", operation,
+            extra={'operation': operation, 'status': 'error', 'error_type': type(e).__name__,
+                   'error': str(e), 'duration_s': round(duration, 3), **context},
+        )
+        raise
+    duration = time.perf_counter() - start
+    OPERATION_SECONDS.observe(duration, operation=operation)
+    logger.info(
+        "%s completed", operation,
+        extra={'operation': operation, 'status': 'ok', 'duration_s': round(duration, 3), **context},
+    )
@@ -1,10 +1,29 @@
 """Data models for COMSOL documentation search."""
 
+from array import array
+import json
+import struct
+import sys
 from dataclasses import dataclass, asdict
-from typing import Optional, List
+from json.encoder import encode_basestring as _encode_json_string
+from typing import Dict, IO, Iterable, Iterator, Optional, List
 
 
-@dataclass
+# Fields in SearchResult declaration order; shared by the columnar container
+# and its serializers so the on-disk layout matches to_dict().
+SEARCH_RESULT_FIELDS = ("module", "title", "path", "snippet", "search_term", "version", "url")
+
+# Fields whose values repeat heavily across results and are worth interning
+_INTERNED_FIELDS = ("module", "path", "search_term", "version")
+
+_BINARY_MAGIC = b"CSR1"
+_NONE_LENGTH = 0xFFFFFFFF
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class SearchResult:
     """Represents a single search result from COMSOL documentation.
 
@@ -25,9 +44,238 @@ class SearchResult:
     version: str
     url: Optional[str] = None
 
+    def __post_init__(self):
+        # Module, path, search term and version are shared by many results;
+        # interning lets them all point at a single string object.
+        for name in _INTERNED_FIELDS:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+
+    def __reduce__(self):
+        # Rebuild through __init__ so unpickled results (e.g. from the
+        # post-processing pool) are interned as well
+        return (type(self), tuple(getattr(self, name) for name in SEARCH_RESULT_FIELDS))
+
     def to_dict(self):
         """Convert to dictionary for backward compatibility."""
-        return asdict(self)
+        # Built directly rather than via asdict(), which deep-copies every field
+        return {
+            "module": self.module,
+            "title": self.title,
+            "path": self.path,
+            "snippet": self.snippet,
+            "search_term": self.search_term,
+            "version": self.version,
+            "url": self.url,
+        }
+
+
+class SearchResultSet:
+    """Column-oriented container for large collections of search results.
+
+    Module, path, search term and version strings are stored once in a shared
+    pool and referenced by compact uint32 index columns, so repeated values
+    cost a single copy no matter how many results use them. Title, snippet and
+    URL are nearly always unique and are kept as plain string columns.
+    Results are materialized as SearchResult objects on access.
+    """
+
+    __slots__ = ("_strings", "_index", "_columns")
+
+    def __init__(self, results: Iterable[SearchResult] = ()):
+        """Initialize the set.
+
+        Args:
+            results: Optional initial SearchResult objects
+        """
+        self._strings: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._columns = {
+            name: array("I") if name in _INTERNED_FIELDS else []
+            for name in SEARCH_RESULT_FIELDS
+        }
+        self.extend(results)
+
+    def _intern(self, value: str) -> int:
+        """Return the pool index for a string, adding it if needed."""
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self._strings)
+            self._strings.append(value)
+            self._index[value] = idx
+        return idx
+
+    def append(self, result: SearchResult):
+        """Add a single result to the set."""
+        for name, column in self._columns.items():
+            value = getattr(result, name)
+            column.append(self._intern(value) if name in _INTERNED_FIELDS else value)
+
+    def extend(self, results: Iterable[SearchResult]):
+        """Add several results to the set."""
+        for result in results:
+            self.append(result)
+
+    def __len__(self) -> int:
+        return len(self._columns["title"])
+
+    def __getitem__(self, i: int) -> SearchResult:
+        return SearchResult(**{
+            name: self._strings[column[i]] if name in _INTERNED_FIELDS else column[i]
+            for name, column in self._columns.items()
+        })
+
+    def __iter__(self) -> Iterator[SearchResult]:
+        for values in zip(*(self.column(name) for name in SEARCH_RESULT_FIELDS)):
+            yield SearchResult(*values)
+
+    def column(self, name: str) -> List[Optional[str]]:
+        """Return all values of one field, in result order.
+
+        Args:
+            name: Field name (one of SEARCH_RESULT_FIELDS)
+        """
+        column = self._columns[name]
+        if name in _INTERNED_FIELDS:
+            strings = self._strings
+            return [strings[idx] for idx in column]
+        return list(column)
+
+    def to_dicts(self) -> List[dict]:
+        """Convert all results to dictionaries (same shape as SearchResult.to_dict)."""
+        columns = [self.column(name) for name in SEARCH_RESULT_FIELDS]
+        return [dict(zip(SEARCH_RESULT_FIELDS, values)) for values in zip(*columns)]
+
+    def dump_jsonl(self, fp: IO[str]):
+        """Write results as JSON Lines, one object per result.
+
+        Pooled strings are JSON-encoded once and reused for every row that
+        references them. Output is identical to writing
+        json.dumps(result.to_dict(), ensure_ascii=False) for each result.
+
+        Args:
+            fp: Text file object to write to
+        """
+        encoded = [_encode_json_string(s) for s in self._strings]
+        columns = []
+        for name in SEARCH_RESULT_FIELDS:
+            column = self._columns[name]
+            if name in _INTERNED_FIELDS:
+                columns.append([encoded[idx] for idx in column])
+            else:
+                columns.append(
+                    ["null" if s is None else _encode_json_string(s) for s in column]
+                )
+        template = "{" + ", ".join(f'"{name}": %s' for name in SEARCH_RESULT_FIELDS) + "}\n"
+        fp.writelines(template % values for values in zip(*columns))
+
+    @classmethod
+    def load_jsonl(cls, fp: IO[str]) -> "SearchResultSet":
+        """Read results written by dump_jsonl.
+
+        Args:
+            fp: Text file object to read from
+
+        Returns:
+            New SearchResultSet
+        """
+        return cls(SearchResult(**json.loads(line)) for line in fp if line.strip())
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact binary form.
+
+        Layout (little-endian): magic, row count, pooled string table, then
+        each field column in SEARCH_RESULT_FIELDS order. Pooled columns are
+        uint32 indices; plain columns are length-prefixed UTF-8 strings with
+        0xFFFFFFFF marking None.
+        """
+        chunks = [_BINARY_MAGIC, struct.pack("<I", len(self))]
+        _pack_strings(chunks, self._strings)
+        for name in SEARCH_RESULT_FIELDS:
+            column = self._columns[name]
+            if name in _INTERNED_FIELDS:
+                indices = array("I", column)
+                if sys.byteorder == "big":
+                    indices.byteswap()
+                chunks.append(indices.tobytes())
+            else:
+                _pack_strings(chunks, column, with_count=False)
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SearchResultSet":
+        """Deserialize from the output of to_bytes.
+
+        Raises:
+            ValueError: If data is not in the expected format
+        """
+        if data[:4] != _BINARY_MAGIC:
+            raise ValueError("Not a serialized SearchResultSet")
+        try:
+            return cls._read_bytes(data)
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"Corrupt serialized SearchResultSet: {e}") from e
+
+    @classmethod
+    def _read_bytes(cls, data: bytes) -> "SearchResultSet":
+        (rows,) = struct.unpack_from("<I", data, 4)
+        result_set = cls()
+        strings, offset = _unpack_strings(data, 8)
+        if None in strings:
+            raise ValueError("Corrupt serialized SearchResultSet: null in string pool")
+        result_set._strings = [sys.intern(s) for s in strings]
+        result_set._index = {s: i for i, s in enumerate(result_set._strings)}
+        for name in SEARCH_RESULT_FIELDS:
+            if name in _INTERNED_FIELDS:
+                end = offset + 4 * rows
+                if end > len(data):
+                    raise ValueError(f"Corrupt serialized SearchResultSet: truncated {name} column")
+                indices = array("I")
+                indices.frombytes(data[offset:end])
+                if sys.byteorder == "big":
+                    indices.byteswap()
+                if rows and max(indices) >= len(strings):
+                    raise ValueError(f"Corrupt serialized SearchResultSet: bad index in {name} column")
+                result_set._columns[name] = indices
+                offset = end
+            else:
+                result_set._columns[name], offset = _unpack_strings(data, offset, rows)
+        if offset != len(data):
+            raise ValueError("Corrupt serialized SearchResultSet: trailing data")
+        return result_set
+
+
+def _pack_strings(chunks: List[bytes], strings: List[Optional[str]], with_count: bool = True):
+    """Append length-prefixed UTF-8 strings (optionally count-prefixed) to chunks."""
+    if with_count:
+        chunks.append(struct.pack("<I", len(strings)))
+    for s in strings:
+        if s is None:
+            chunks.append(struct.pack("<I", _NONE_LENGTH))
+        else:
+            data = s.encode("utf-8")
+            chunks.append(struct.pack("<I", len(data)))
+            chunks.append(data)
+
+
+def _unpack_strings(data: bytes, offset: int, count: Optional[int] = None):
+    """Read strings written by _pack_strings; returns (strings, new offset)."""
+    if count is None:
+        (count,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+    strings: List[Optional[str]] = []
+    for _ in range(count):
+        (length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        if length == _NONE_LENGTH:
+            strings.append(None)
+        else:
+            if offset + length > len(data):
+                raise ValueError("Corrupt serialized SearchResultSet: truncated string")
+            strings.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+    return strings, offset
 
 
 @dataclass
@@ -0,0 +1,309 @@
+"""Parsing of COMSOL documentation pages.
+
+The build_* functions turn rendered page text into results; single-shot
+calls feed them the browser's own innerText. The parse_* functions work on
+captured HTML strings only (no browser objects), so they can run in worker
+processes while the browser captures the next page.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+from .models import SearchResult, DocumentContent
+from .config import (
+    SEARCH_RESULTS_LINK_SELECTOR,
+    SEARCH_RESULTS_PATH_SELECTOR,
+    SEARCH_HIT_SELECTOR,
+)
+
+# Keywords that mark a path segment as a module or guide name
+MODULE_KEYWORDS = [
+    # Modules (with "Module" in name)
+    'battery design module', 'cfd module', 'heat transfer module',
+    'structural mechanics module', 'acoustics module',
+    'chemical reaction engineering module', 'corrosion module',
+    'electrochemistry module', 'electrodeposition module',
+    'fuel cell', 'electrolyzer module', 'microfluidics module',
+    'optimization module', 'plasma module', 'pipe flow module',
+    'porous media flow module', 'polymer flow module',
+    'subsurface flow module', 'electric discharge module',
+    # Guides and special sections
+    'application programming', 'programming guide', 'physics builder',
+    'model manager', 'material library',
+    # Keywords that indicate module-specific content
+    'module', 'battery', 'cfd', 'plasma', 'api'
+]
+
+# Elements whose content the browser never renders as text
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'head'}
+
+# Elements the browser lays out on their own line
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hr', 'li', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul',
+}
+
+# Table cells, which the browser separates with tabs within a row
+CELL_TAGS = {'td', 'th'}
+
+# Marks a cell boundary until whitespace has been collapsed
+_CELL_SEPARATOR = '\x1f'
+
+
+def _is_hidden(element: Tag) -> bool:
+    """Whether an element is never rendered (as far as the markup tells)."""
+    if element.name in SKIPPED_TAGS or element.has_attr('hidden'):
+        return True
+    style = element.get('style', '').replace(' ', '').lower()
+    return 'display:none' in style or 'visibility:hidden' in style
+
+
+def _inner_text(element: Tag) -> str:
+    """Approximate the browser's innerText(), stripped.
+
+    Block elements and <br> start new lines, table cells in a row are
+    separated by tabs, whitespace within a line is collapsed, and script,
+    noscript, template and hidden elements are skipped. Elements hidden only
+    through CSS classes cannot be detected from markup, so captured pages
+    should have them removed in the browser first.
+    """
+    parts = []
+    stack = list(reversed(list(element.children)))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Tag):
+            if _is_hidden(node):
+                continue
+            if node.name in BLOCK_TAGS:
+                parts.append('\n')
+            elif node.name in CELL_TAGS and node.find_previous_sibling(CELL_TAGS):
+                parts.append(_CELL_SEPARATOR)
+                stack.append('\n')  # Close the block after its children
+            stack.extend(reversed(list(node.children)))
+        elif isinstance(node, NavigableString):
+            # Skip comments, doctypes and other non-text nodes
+            if type(node) is NavigableString:
+                parts.append(str(node))
+        else:
+            parts.append(node)
+    lines = (
+        '\t'.join(' '.join(cell.split()) for cell in line.split(_CELL_SEPARATOR))
+        for line in ''.join(parts).split('\n')
+    )
+    return '\n'.join(line for line in lines if line.strip())
+
+
+def detect_module(path_parts: List[str]) -> str:
+    """Classify a result by module from its breadcrumb path.
+
+    Path format: "COMSOL Multiphysics > Release Notes > Battery Design Module > ..."
+    or: "COMSOL Multiphysics > Reference Manual > ...". Module-specific content
+    often appears in later path segments.
+
+    Args:
+        path_parts: Breadcrumb path segments
+
+    Returns:
+        Module or guide name, or "Unknown"
+    """
+    # Strategy 1: Look for explicit module/guide names in path segments
+    if len(path_parts) > 1:
+        for part in path_parts:
+            part_lower = part.lower()
+            if any(keyword in part_lower for keyword in MODULE_KEYWORDS):
+                return part
+
+    # Strategy 2: Special handling for API/Programming documentation
+    full_path_lower = ' > '.join(path_parts).lower()
+    api_indicators = ['programming', 'java', 'api', 'method', 'script']
+    if any(indicator in full_path_lower for indicator in api_indicators):
+        # Look for "Application Programming Guide" or "Model Manager API" specifically
+        for part in path_parts:
+            if 'programming' in part.lower() or 'api' in part.lower():
+                return part
+
+    if len(path_parts) <= 1:
+        return "Unknown"
+
+    # Strategy 3: Detect guides/manuals (prefer specific over generic)
+    for part in path_parts:
+        if part.lower() in ['physics builder manual', 'application programming guide',
+                            'model manager reference manual', 'introduction to the application builder']:
+            return part
+
+    # Strategy 4: Use second path segment (usually the manual/guide name)
+    # Skip generic "COMSOL Multiphysics" and get the next meaningful segment
+    for part in path_parts:
+        if part.strip() and part != "COMSOL Multiphysics":
+            return part
+
+    return "Unknown"
+
+
+def clean_path(path_parts: List[str]) -> str:
+    """Join breadcrumb segments, dropping consecutive duplicates and truncating.
+
+    Args:
+        path_parts: Breadcrumb path segments
+
+    Returns:
+        Path string of at most 500 characters
+    """
+    cleaned_segments = []
+    last_segment = None
+    for seg in ' > '.join(path_parts).split(' > '):
+        if seg != last_segment:
+            cleaned_segments.append(seg)
+            last_segment = seg
+    path = ' > '.join(cleaned_segments)
+
+    # Truncate path if still too long to avoid token overflow
+    if len(path) > 500:
+        # Take last 450 chars and add ellipsis
+        path = '...' + path[-450:]
+    return path
+
+
+def build_search_results(
+    links: Sequence[Tuple[str, Optional[str]]],
+    path_texts: Sequence[Sequence[str]],
+    snippets: Sequence[str],
+    search_term: str,
+    version: str,
+    base_url: str,
+    max_results: int,
+) -> List[SearchResult]:
+    """Build search results from the rendered text of a results page.
+
+    Args:
+        links: (title text, href) of each result link, in page order
+        path_texts: Text of the breadcrumb segments of each result
+        snippets: Text of each result snippet
+        search_term: The search term that produced the page
+        version: COMSOL version
+        base_url: Docserver base URL, used to resolve result links
+        max_results: Maximum number of results to return
+
+    Returns:
+        List of SearchResult objects
+    """
+    # Each result is a triplet: link, path, snippet
+    # They appear in order in the DOM
+    results = []
+    for i, (title, href) in enumerate(links[:max_results]):
+        path_parts = []
+        if i < len(path_texts):
+            path_parts = [
+                text.strip() for text in path_texts[i] if text.strip() and '>' not in text
+            ]
+
+        snippet = snippets[i].strip() if i < len(snippets) else ""
+        # Truncate long snippets
+        if len(snippet) > 400:
+            snippet = snippet[:400] + '...'
+
+        # Resolve the relative URL from the link's href attribute
+        url: Optional[str] = f"{base_url}{href}" if href else None
+
+        results.append(SearchResult(
+            module=detect_module(path_parts),
+            title=title.strip(),
+            path=clean_path(path_parts),
+            snippet=snippet,
+            search_term=search_term,
+            version=version,
+            url=url,
+        ))
+
+    return results
+
+
+def parse_search_results(
+    html: str,
+    search_term: str,
+    version: str,
+    base_url: str,
+    max_results: int,
+) -> List[SearchResult]:
+    """Extract search results from a captured search results page.
+
+    Args:
+        html: Page HTML after the search results have rendered
+        search_term: The search term that produced the page
+        version: COMSOL version
+        base_url: Docserver base URL, used to resolve result links
+        max_results: Maximum number of results to return
+
+    Returns:
+        List of SearchResult objects
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    links = [(_inner_text(link), link.get('href')) for link in soup.select(SEARCH_RESULTS_LINK_SELECTOR)]
+    path_texts = [
+        [_inner_text(p) for p in container.select(SEARCH_RESULTS_PATH_SELECTOR)]
+        for container in soup.select('.searchResultsPath')
+    ]
+    snippets = [_inner_text(elem) for elem in soup.select(SEARCH_HIT_SELECTOR)]
+    return build_search_results(links, path_texts, snippets, search_term, version, base_url, max_results)
+
+
+def build_document(
+    url: str,
+    title: str,
+    breadcrumb_texts: Sequence[str],
+    body_text: str,
+    panel_texts: Sequence[str],
+) -> DocumentContent:
+    """Build document content from the rendered text of a documentation page.
+
+    Args:
+        url: Full URL of the page
+        title: Page title
+        breadcrumb_texts: Text of the breadcrumb segments
+        body_text: Text of the whole page body
+        panel_texts: Text of each documentation panel
+
+    Returns:
+        DocumentContent object
+    """
+    breadcrumb = [text.strip() for text in breadcrumb_texts if text.strip()]
+
+    # Prefer the documentation panels over the whole page body
+    content = body_text
+    content_parts = []
+    for text in panel_texts:
+        text = text.strip()
+        if len(text) > 50:  # Filter out empty or very short sections
+            content_parts.append(text)
+    if content_parts:
+        content = '\n\n'.join(content_parts)
+
+    return DocumentContent(
+        url=url,
+        title=title,
+        content=content,
+        breadcrumb=breadcrumb
+    )
+
+
+def parse_document(html: str, url: str, title: str) -> DocumentContent:
+    """Extract document content from a captured documentation page.
+
+    Args:
+        html: Page HTML after the content panels have rendered
+        url: Full URL of the page
+        title: Page title
+
+    Returns:
+        DocumentContent object
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    return build_document(
+        url,
+        title,
+        [_inner_text(elem) for elem in soup.select(SEARCH_RESULTS_PATH_SELECTOR)],
+        _inner_text(soup.body) if soup.body else "",
+        [_inner_text(section) for section in soup.select('.v-panel-content')],
+    )
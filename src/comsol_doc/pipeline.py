@@ -0,0 +1,175 @@
+"""Parallel post-processing of captured documentation HTML.
+
+The browser thread only captures raw page HTML; parsing, cleaning, module
+classification and output formatting run in a process pool so Chromium can
+move on to the next page in the meantime.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple, TypeVar
+import multiprocessing
+import os
+
+from .models import SearchResult, DocumentContent
+from .parsing import parse_search_results, parse_document
+from .formatters import OutputFormatter
+from .metrics import OPERATION_ERRORS, POSTPROCESS_PENDING
+
+T = TypeVar('T')
+
+
+def process_search_html(
+    html: str,
+    search_term: str,
+    version: str,
+    base_url: str,
+    max_results: int,
+    format: Optional[str] = None,
+) -> Tuple[List[SearchResult], Optional[str]]:
+    """Parse a captured search page and optionally format the results.
+
+    Args:
+        html: Captured page HTML (empty if the search box never appeared)
+        search_term: The search term that produced the page
+        version: COMSOL version
+        base_url: Docserver base URL
+        max_results: Maximum number of results to return
+        format: Output format for OutputFormatter.format_search_results, or None
+
+    Returns:
+        Tuple of (results, formatted output or None)
+    """
+    results = parse_search_results(html, search_term, version, base_url, max_results) if html else []
+    formatted = OutputFormatter.format_search_results(results, format) if format else None
+    return results, formatted
+
+
+def process_document_html(
+    html: str,
+    url: str,
+    title: str,
+    format: Optional[str] = None,
+) -> Tuple[DocumentContent, Optional[str]]:
+    """Parse a captured documentation page and optionally format it.
+
+    Args:
+        html: Captured page HTML
+        url: Full URL of the page
+        title: Page title
+        format: Output format for OutputFormatter.format_document_content, or None
+
+    Returns:
+        Tuple of (document, formatted output or None)
+    """
+    doc = parse_document(html, url, title)
+    formatted = OutputFormatter.format_document_content(doc, format) if format else None
+    return doc, formatted
+
+
+def _count_failure(future: Future):
+    """Record post-processing errors in the operational metrics."""
+    error = future.exception()
+    if error is not None:
+        OPERATION_ERRORS.inc(operation='postprocess', type=type(error).__name__)
+
+
+class PostProcessor:
+    """Runs HTML post-processing in a process pool behind a bounded queue.
+
+    Captured pages are submitted as soon as they are available. At most
+    ``max_pending`` pages are in flight at once; when the queue is full the
+    capturing thread waits for the oldest page to finish, which keeps memory
+    bounded if the browser outpaces the workers. Results come back in
+    submission order.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """Initialize the post-processor.
+
+        Args:
+            workers: Worker processes (default: CPU count; 0 processes inline)
+            max_pending: Maximum pages in flight (default: twice the worker count)
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or 2 * max(self.workers, 1)
+        self._executor = None
+        if self.workers > 0:
+            # Spawn rather than fork: the parent holds Playwright's driver
+            # connection and threads, which must not be duplicated
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> 'Future[T]':
+        """Schedule fn(*args) on the pool (or run it now when inline)."""
+        if self._executor:
+            future = self._executor.submit(fn, *args)
+        else:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+        future.add_done_callback(_count_failure)
+        return future
+
+    def run(
+        self,
+        items: Iterable[Any],
+        capture: Callable[[Any], tuple],
+        fn: Callable[..., T],
+    ) -> Iterator[Tuple[Any, 'Future[T]']]:
+        """Pipeline capture and processing over a sequence of items.
+
+        Args:
+            items: Work items (search terms, URLs, ...)
+            capture: Called on the current thread for each item; returns the
+                argument tuple for fn
+            fn: Picklable processing function run in the pool
+
+        Yields:
+            (item, future) pairs in input order, each future already finished.
+            Capture and processing errors are raised by future.result().
+        """
+        pending: Deque[Tuple[Any, 'Future[T]']] = deque()
+        try:
+            for item in items:
+                try:
+                    future = self.submit(fn, *capture(item))
+                except Exception as e:
+                    future = Future()
+                    future.set_exception(e)
+                pending.append((item, future))
+                POSTPROCESS_PENDING.inc()
+
+                # Emit finished work in order; block only when the queue is full
+                while pending and (len(pending) >= self.max_pending or pending[0][1].done()):
+                    yield self._finish(pending.popleft())
+
+            while pending:
+                yield self._finish(pending.popleft())
+        finally:
+            # The consumer stopped early (close(), an exception, Ctrl-C):
+            # abandoned items no longer count as pending
+            POSTPROCESS_PENDING.dec(len(pending))
+
+    @staticmethod
+    def _finish(entry: Tuple[Any, 'Future[T]']) -> Tuple[Any, 'Future[T]']:
+        """Wait for a queued item to complete."""
+        entry[1].exception()
+        POSTPROCESS_PENDING.dec()
+        return entry
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
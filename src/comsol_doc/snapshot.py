@@ -0,0 +1,272 @@
+"""Local documentation snapshots and incremental updates between releases."""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+import hashlib
+import json
+
+from .core import ComsolDocSearcher
+from .models import DocumentContent
+from .pipeline import PostProcessor
+from .metrics import CACHE_REQUESTS
+from .config import FINGERPRINT_WORKERS, SNAPSHOT_CHECKPOINT_INTERVAL, PRUNE_MAX_FRACTION
+
+
+def content_hash(doc: DocumentContent) -> str:
+    """Hash the parts of a document that matter to readers.
+
+    Args:
+        doc: DocumentContent object
+
+    Returns:
+        SHA-256 hex digest of title, breadcrumb and content
+    """
+    payload = json.dumps([doc.title, doc.breadcrumb, doc.content], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class ChangeReport:
+    """Summary of an incremental snapshot update.
+
+    Attributes:
+        version: COMSOL version of the snapshot
+        added: URLs of pages new in the table of contents and now stored
+        removed: URLs of pages no longer in the table of contents
+        kept_missing: URLs missing from the listing but kept because removing
+            them needs prune=True (see IncrementalUpdater.update)
+        changed: URLs of pages whose content changed
+        unchanged: Number of pages that were kept as-is
+        refetched: Number of pages rendered through the browser
+        failed: URL -> error message for pages that could not be retrieved
+    """
+    version: str
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    kept_missing: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    refetched: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self):
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+class DocSnapshot:
+    """A local copy of rendered documentation pages stored on disk.
+
+    Layout: ``manifest.json`` maps each page URL to its document file and
+    hashes, and ``pages/`` holds one JSON-serialized DocumentContent per page.
+    Page files are written as they are fetched but only become part of the
+    snapshot when the manifest is saved; IncrementalUpdater saves it
+    periodically and when an update ends, including on errors.
+    """
+
+    MANIFEST_NAME = 'manifest.json'
+    PAGES_DIR = 'pages'
+
+    def __init__(self, root: Path, version: str):
+        """Open (or prepare) a snapshot directory.
+
+        Args:
+            root: Snapshot directory
+            version: COMSOL version the snapshot tracks
+
+        Raises:
+            ValueError: If the directory holds a snapshot of another version
+        """
+        self.root = Path(root)
+        self.version = version
+        self.pages: Dict[str, dict] = {}
+
+        manifest_path = self.root / self.MANIFEST_NAME
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            if manifest.get('version') != version:
+                raise ValueError(
+                    f"Snapshot at {self.root} is for version {manifest.get('version')}, not {version}"
+                )
+            self.pages = manifest.get('pages', {})
+
+    def urls(self) -> List[str]:
+        """Return URLs of all pages in the snapshot."""
+        return list(self.pages)
+
+    def fingerprint(self, url: str) -> Optional[str]:
+        """Return the stored static-HTML fingerprint of a page, if any."""
+        entry = self.pages.get(url)
+        return entry.get('fingerprint') if entry else None
+
+    def get(self, url: str) -> Optional[DocumentContent]:
+        """Load a stored page.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            DocumentContent object, or None if the page is not in the snapshot
+        """
+        entry = self.pages.get(url)
+        if not entry:
+            return None
+        data = json.loads((self.root / self.PAGES_DIR / entry['file']).read_text(encoding='utf-8'))
+        return DocumentContent(**data)
+
+    def put(self, doc: DocumentContent, fingerprint: Optional[str]) -> bool:
+        """Store a page, replacing any previous copy.
+
+        Args:
+            doc: Retrieved page content
+            fingerprint: Static-HTML fingerprint of the page (may be None)
+
+        Returns:
+            True if the page content differs from the stored copy
+        """
+        digest = content_hash(doc)
+        entry = self.pages.get(doc.url)
+        changed = entry is None or entry.get('content_hash') != digest
+
+        file_name = hashlib.sha1(doc.url.encode('utf-8')).hexdigest() + '.json'
+        if changed:
+            pages_dir = self.root / self.PAGES_DIR
+            pages_dir.mkdir(parents=True, exist_ok=True)
+            (pages_dir / file_name).write_text(
+                json.dumps(doc.to_dict(), ensure_ascii=False), encoding='utf-8'
+            )
+
+        self.pages[doc.url] = {
+            'file': file_name,
+            'fingerprint': fingerprint,
+            'content_hash': digest,
+        }
+        return changed
+
+    def remove(self, url: str):
+        """Delete a page from the snapshot."""
+        entry = self.pages.pop(url, None)
+        if entry:
+            (self.root / self.PAGES_DIR / entry['file']).unlink(missing_ok=True)
+
+    def save(self):
+        """Write the manifest to disk."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            'version': self.version,
+            'updated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'pages': self.pages,
+        }
+        (self.root / self.MANIFEST_NAME).write_text(
+            json.dumps(manifest, indent=2, ensure_ascii=False), encoding='utf-8'
+        )
+
+
+class IncrementalUpdater:
+    """Brings a DocSnapshot up to date with the live documentation.
+
+    New pages are always rendered. Pages already in the snapshot are only
+    re-rendered when the hash of their static HTML differs from the stored
+    fingerprint (or cannot be determined), so a patch-release refresh renders
+    just the pages that actually changed.
+    """
+
+    def __init__(
+        self,
+        searcher: ComsolDocSearcher,
+        snapshot: DocSnapshot,
+        processor: Optional[PostProcessor] = None,
+    ):
+        """Initialize the updater.
+
+        Args:
+            searcher: Searcher used to list and render pages
+            snapshot: Snapshot to update in place
+            processor: PostProcessor for parsing rendered pages (default: inline)
+        """
+        self.searcher = searcher
+        self.snapshot = snapshot
+        self.processor = processor or PostProcessor(workers=0)
+
+    def update(
+        self,
+        urls: Optional[Iterable[str]] = None,
+        progress: Optional[Callable[[str], None]] = None,
+        prune: bool = False,
+    ) -> ChangeReport:
+        """Update the snapshot and report what changed.
+
+        Pages missing from the listing are only deleted if the listing is
+        non-empty and drops at most PRUNE_MAX_FRACTION of the snapshot, since
+        an incomplete table of contents would otherwise wipe stored pages.
+        Pass prune=True to delete them regardless.
+
+        Args:
+            urls: Current page URLs (default: read from the table of contents)
+            progress: Optional callback receiving status messages
+            prune: Delete missing pages even when the listing looks incomplete
+
+        Returns:
+            ChangeReport describing the update
+        """
+        notify = progress or (lambda message: None)
+
+        if urls is None:
+            notify("Reading table of contents...")
+            urls = self.searcher.list_pages()
+        current = list(dict.fromkeys(urls))
+        current_set = set(current)
+        previous = set(self.snapshot.urls())
+
+        report = ChangeReport(version=self.snapshot.version)
+        report.added = [url for url in current if url not in previous]
+        missing = sorted(previous - current_set)
+        if prune or (current and len(missing) <= PRUNE_MAX_FRACTION * len(previous)):
+            report.removed = missing
+        else:
+            report.kept_missing = missing
+
+        notify(f"Checking {len(current)} pages for changes...")
+        with ThreadPoolExecutor(max_workers=FINGERPRINT_WORKERS) as pool:
+            fingerprints = dict(zip(current, pool.map(self.searcher.fetch_fingerprint, current)))
+
+        to_fetch = [
+            url for url in current
+            if url not in previous
+            or fingerprints[url] is None
+            or fingerprints[url] != self.snapshot.fingerprint(url)
+        ]
+        report.unchanged = len(current) - len(to_fetch)
+        CACHE_REQUESTS.inc(report.unchanged, result='hit')
+        CACHE_REQUESTS.inc(len(to_fetch), result='miss')
+
+        try:
+            retrieved = self.searcher.retrieve_many(to_fetch, self.processor)
+            for i, (url, future) in enumerate(retrieved, 1):
+                notify(f"Retrieved page {i}/{len(to_fetch)}...")
+                try:
+                    doc, _ = future.result()
+                except Exception as e:
+                    report.failed[url] = str(e)
+                    continue
+                report.refetched += 1
+                if self.snapshot.put(doc, fingerprints[url]):
+                    if url in previous:
+                        report.changed.append(url)
+                elif url in previous:
+                    report.unchanged += 1
+                if report.refetched % SNAPSHOT_CHECKPOINT_INTERVAL == 0:
+                    self.snapshot.save()
+
+            for url in report.removed:
+                self.snapshot.remove(url)
+
+        finally:
+            self.snapshot.save()
+
+        # Only report pages that actually made it into the snapshot
+        report.added = [url for url in report.added if url not in report.failed]
+        return report
@@ -0,0 +1,149 @@
+"""Tests for query expansion, rank fusion and concurrent sub-queries."""
+
+import json
+
+import pytest
+
+from comsol_doc.config import SEARCH_RESULTS_LINK_SELECTOR
+from comsol_doc.core import ComsolDocSearcher
+from comsol_doc.expansion import expand_query, fuse_results, load_synonyms
+from comsol_doc.models import SearchResult
+
+
+def result(title, url, term="q"):
+    return SearchResult("Module", title, "A > B", "", term, "6.4", url)
+
+
+@pytest.mark.parametrize("term", ["transient heat transfer", "Seismic analysis", "remeshing"])
+def test_synonyms_only_match_whole_words(term):
+    assert expand_query(term, synonyms=load_synonyms()) == [term]
+
+
+def test_synonyms_prefer_longest_phrase():
+    queries = expand_query("mesh refinement", synonyms=load_synonyms(), max_queries=10)
+    assert queries == ["mesh refinement", "mesh", "meshing"]
+
+
+def test_synonym_expansion():
+    queries = expand_query("Battery aging model", synonyms=load_synonyms())
+    assert queries == ["Battery aging model", "capacity fade model", "battery degradation model"]
+
+
+def test_explicit_variants_are_never_capped():
+    variants = [f"variant {i}" for i in range(6)]
+    queries = expand_query("battery aging", variants, load_synonyms(), max_queries=4)
+    assert queries == ["battery aging", *variants]
+
+
+def test_synonyms_fill_remaining_slots():
+    queries = expand_query("battery aging", ["capacity fade"], load_synonyms(), max_queries=3)
+    assert queries == ["battery aging", "capacity fade", "battery degradation"]
+
+
+def test_duplicates_are_removed():
+    assert expand_query("Battery aging", ["battery  AGING", "", "fade"]) == ["Battery aging", "fade"]
+
+
+def test_load_synonyms_from_file(tmp_path):
+    path = tmp_path / "synonyms.json"
+    path.write_text(json.dumps([["Foo", "Bar"]]))
+    assert load_synonyms(path) == [["foo", "bar"]]
+
+    path.write_text(json.dumps({"foo": "bar"}))
+    with pytest.raises(ValueError):
+        load_synonyms(path)
+
+
+def test_fuse_results_ranks_shared_hits_first_and_dedupes():
+    a = [result("A", "u1"), result("B", "u2")]
+    b = [result("B", "u2", "q2"), result("C", "u3", "q2")]
+    fused = fuse_results([a, b], max_results=10)
+    assert [r.title for r in fused] == ["B", "A", "C"]
+    # The entry kept for a duplicate comes from its best-ranked occurrence
+    assert fused[0].search_term == "q2"
+
+
+def test_fuse_results_without_urls_uses_title_and_path():
+    a = [result("A", None), result("A", None)]
+    assert len(fuse_results([a], max_results=10)) == 1
+
+
+def test_fuse_results_respects_max_results():
+    a = [result(str(i), f"u{i}") for i in range(5)]
+    assert len(fuse_results([a, a], max_results=2)) == 2
+
+
+class FakeBox:
+    def __init__(self, page):
+        self.page = page
+
+    def fill(self, text):
+        self.page.term = text
+
+    def press(self, key):
+        pass
+
+
+class FakePage:
+    def __init__(self, fail_on):
+        self.fail_on = fail_on
+        self.term = None
+        self.closed = False
+
+    def goto(self, url, **kwargs):
+        pass
+
+    def wait_for_selector(self, selector, **kwargs):
+        if self.term is not None and self.term in self.fail_on:
+            raise TimeoutError(f"{self.term} timed out")
+        return FakeBox(self)
+
+    def eval_on_selector_all(self, selector, script, arg=None):
+        if selector == SEARCH_RESULTS_LINK_SELECTOR:
+            return [[self.term, f"#!/{self.term}.html"]]
+        return []
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, fail_on=(), max_pages=None):
+        self.fail_on = fail_on
+        self.max_pages = max_pages
+        self.pages = []
+
+    def new_page(self):
+        if self.max_pages is not None and len(self.pages) >= self.max_pages:
+            raise RuntimeError("browser closed")
+        page = FakePage(self.fail_on)
+        self.pages.append(page)
+        return page
+
+
+def searcher_with(browser):
+    searcher = ComsolDocSearcher(version="6.4")
+    searcher.browser = browser
+    return searcher
+
+
+def test_search_concurrent_keeps_successful_sub_queries():
+    browser = FakeBrowser(fail_on={"slow"})
+    results = searcher_with(browser).search_concurrent(["a", "slow", "b"])
+    assert [[r.title for r in rs] for rs in results] == [["a"], [], ["b"]]
+    assert all(page.closed for page in browser.pages)
+
+
+def test_search_concurrent_raises_when_all_fail():
+    browser = FakeBrowser(fail_on={"a", "b"})
+    with pytest.raises(Exception, match="Error during search"):
+        searcher_with(browser).search_concurrent(["a", "b"])
+    assert all(page.closed for page in browser.pages)
+
+
+def test_search_concurrent_closes_pages_when_opening_fails():
+    browser = FakeBrowser(max_pages=2)
+    with pytest.raises(Exception, match="browser closed"):
+        searcher_with(browser).search_concurrent(["a", "b", "c"])
+    assert len(browser.pages) == 2
+    assert all(page.closed for page in browser.pages)
@@ -0,0 +1,156 @@
+"""Tests for the metrics registry, structured logging and their CLI options."""
+
+import json
+import logging
+import socket
+import urllib.request
+
+import pytest
+from typer.testing import CliRunner
+
+from comsol_doc import cli, logs
+from comsol_doc.logs import JsonFormatter, configure_logging
+from comsol_doc.metrics import OPERATION_ERRORS, MetricsRegistry, track
+
+
+def test_render_counter_and_gauge():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests")
+    requests.inc(operation="search")
+    requests.inc(2, operation="search")
+    registry.gauge("pages_open", "Open pages").set(1.5)
+
+    assert registry.render_prometheus() == (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{operation="search"} 3\n'
+        "# HELP pages_open Open pages\n"
+        "# TYPE pages_open gauge\n"
+        "pages_open 1.5\n"
+    )
+
+
+def test_render_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(1, 5))
+    for value in (0.5, 2, 10):
+        latency.observe(value, op="a")
+
+    lines = registry.render_prometheus().splitlines()[2:]
+    assert lines == [
+        'latency_seconds_bucket{op="a",le="1"} 1',
+        'latency_seconds_bucket{op="a",le="5"} 2',
+        'latency_seconds_bucket{op="a",le="+Inf"} 3',
+        'latency_seconds_sum{op="a"} 12.5',
+        'latency_seconds_count{op="a"} 3',
+    ]
+    sample = registry.to_dict()["metrics"]["latency_seconds"]["samples"][0]
+    assert sample["buckets"] == {"1": 1, "5": 2, "+Inf": 3}
+    assert sample["mean"] == pytest.approx(12.5 / 3)
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors").inc(error='say "hi"\\\n')
+    assert 'errors_total{error="say \\"hi\\"\\\\\\n"} 1' in registry.render_prometheus()
+
+
+def test_gauge_callback_is_read_at_export_time():
+    registry = MetricsRegistry()
+    value = None
+    registry.gauge("ratio", "Ratio", callback=lambda: value)
+    assert registry.render_prometheus().splitlines()[2:] == []
+    value = 0.25
+    assert "ratio 0.25\n" in registry.render_prometheus()
+
+
+def test_reregistering_returns_existing_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("a", "A") is registry.counter("a", "A")
+    with pytest.raises(ValueError):
+        registry.gauge("a", "A")
+
+
+def test_write_json_and_text(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits").inc()
+
+    registry.write(tmp_path / "metrics.json")
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    assert data["metrics"]["hits_total"]["samples"] == [{"labels": {}, "value": 1}]
+
+    registry.write(tmp_path / "metrics.prom")
+    assert "hits_total 1\n" in (tmp_path / "metrics.prom").read_text()
+
+
+def test_serve_exposes_metrics():
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits").inc()
+    server = registry.serve(0)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/metrics") as response:
+            assert "hits_total 1" in response.read().decode()
+        with urllib.request.urlopen(f"{base}/metrics.json") as response:
+            assert "hits_total" in json.load(response)["metrics"]
+    finally:
+        registry.stop()
+
+
+def test_track_counts_failures():
+    before = OPERATION_ERRORS.value(operation="test_op", type="KeyError")
+    with track("test_op"):
+        pass
+    with pytest.raises(KeyError):
+        with track("test_op"):
+            raise KeyError("missing")
+    assert OPERATION_ERRORS.value(operation="test_op", type="KeyError") == before + 1
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord("comsol_doc.core", logging.INFO, __file__, 1, "search %s", ("done",), None)
+    record.operation = "search"
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "search done"
+    assert entry["level"] == "INFO"
+    assert entry["operation"] == "search"
+
+
+def test_configure_logging_rejects_unknown_level():
+    with pytest.raises(ValueError):
+        configure_logging(level="LOUD")
+
+
+def test_configure_logging_replaces_previous_handler(tmp_path, monkeypatch):
+    package_logger = logging.getLogger("comsol_doc")
+    monkeypatch.setattr(package_logger, "handlers", [])
+    monkeypatch.setattr(package_logger, "propagate", True)
+    monkeypatch.setattr(package_logger, "level", package_logger.level)
+    monkeypatch.setattr(logs, "_handler", None)
+
+    first, second = tmp_path / "first.log", tmp_path / "second.log"
+    configure_logging(path=first)
+    configure_logging(path=second)
+    logging.getLogger("comsol_doc.test").info("once")
+    logs._handler.close()
+
+    assert first.read_text() == ""
+    [line] = second.read_text().splitlines()
+    assert json.loads(line)["message"] == "once"
+    assert len(package_logger.handlers) == 1
+
+
+def test_cli_rejects_unknown_log_level():
+    result = CliRunner().invoke(cli.app, ["--log-level", "LOUD", "version"])
+    assert result.exit_code == 1
+    assert "Invalid log level" in result.output
+
+
+def test_cli_reports_metrics_port_in_use():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        port = sock.getsockname()[1]
+        result = CliRunner().invoke(cli.app, ["--metrics-port", str(port), "version"])
+    assert result.exit_code == 1
+    assert "Cannot serve metrics" in result.output
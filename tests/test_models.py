@@ -0,0 +1,104 @@
+"""Tests for result models and the columnar SearchResultSet."""
+
+import io
+import json
+import pickle
+import sys
+
+import pytest
+
+from comsol_doc.models import SearchResult, SearchResultSet
+
+
+def make_results():
+    return [
+        SearchResult("Battery Design Module", "Aging", "A > B", "fade", "battery aging", "6.4",
+                     "https://doc.comsol.com/6.4/docserver/#!/a.html"),
+        SearchResult("Battery Design Module", "Lithium “ion”", "A > B", "snippet\nwith newline",
+                     "battery aging", "6.4"),
+        SearchResult("CFD Module", "Turbulence", "A > C", "", "turbulent flow", "6.4", "ü"),
+    ]
+
+
+def test_search_result_interns_repeated_fields():
+    a = SearchResult("".join("Mod"), "t", "".join("p > q"), "s", "".join("term"), "".join("6.4"))
+    b = SearchResult("".join("Mod"), "t", "".join("p > q"), "s", "".join("term"), "".join("6.4"))
+    assert a.module is b.module
+    assert a.path is b.path
+    assert a.version is b.version
+
+
+def test_unpickled_results_are_interned():
+    a, b = (pickle.loads(pickle.dumps(result)) for result in make_results()[:2])
+    assert a == make_results()[0]
+    assert a.module is b.module
+    assert a.path is b.path
+    assert a.search_term is b.search_term
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses need Python 3.10")
+def test_search_result_has_no_instance_dict():
+    assert not hasattr(make_results()[0], "__dict__")
+
+
+def test_to_dict_matches_fields():
+    result = make_results()[0]
+    assert result.to_dict() == {
+        "module": result.module,
+        "title": result.title,
+        "path": result.path,
+        "snippet": result.snippet,
+        "search_term": result.search_term,
+        "version": result.version,
+        "url": result.url,
+    }
+
+
+def test_result_set_access():
+    results = make_results()
+    result_set = SearchResultSet(results)
+    assert len(result_set) == 3
+    assert list(result_set) == results
+    assert result_set[1] == results[1]
+    assert result_set[-1] == results[-1]
+    assert result_set.column("url") == [r.url for r in results]
+    assert result_set.to_dicts() == [r.to_dict() for r in results]
+
+
+def test_dump_jsonl_matches_json_dumps_and_round_trips():
+    results = make_results()
+    fp = io.StringIO()
+    SearchResultSet(results).dump_jsonl(fp)
+    expected = "".join(json.dumps(r.to_dict(), ensure_ascii=False) + "\n" for r in results)
+    assert fp.getvalue() == expected
+
+    fp.seek(0)
+    assert list(SearchResultSet.load_jsonl(fp)) == results
+
+
+def test_binary_round_trip():
+    results = make_results()
+    restored = SearchResultSet.from_bytes(SearchResultSet(results).to_bytes())
+    assert list(restored) == results
+
+
+def test_binary_round_trip_empty():
+    assert len(SearchResultSet.from_bytes(SearchResultSet().to_bytes())) == 0
+
+
+def test_from_bytes_rejects_wrong_magic():
+    with pytest.raises(ValueError):
+        SearchResultSet.from_bytes(b"NOPE" + b"\0" * 8)
+
+
+@pytest.mark.parametrize("cut", [1, 3, 10, 40])
+def test_from_bytes_rejects_truncated_data(cut):
+    data = SearchResultSet(make_results()).to_bytes()
+    with pytest.raises(ValueError):
+        SearchResultSet.from_bytes(data[:-cut])
+
+
+def test_from_bytes_rejects_trailing_data():
+    data = SearchResultSet(make_results()).to_bytes()
+    with pytest.raises(ValueError):
+        SearchResultSet.from_bytes(data + b"\0")
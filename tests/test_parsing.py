@@ -0,0 +1,189 @@
+"""Tests for parsing captured docserver pages and reading rendered page text."""
+
+import pytest
+
+from comsol_doc.config import (
+    SEARCH_HIT_SELECTOR,
+    SEARCH_RESULTS_LINK_SELECTOR,
+    SEARCH_RESULTS_PATH_SELECTOR,
+)
+from comsol_doc.core import ComsolDocSearcher
+from comsol_doc.parsing import clean_path, detect_module, parse_document, parse_search_results
+
+BASE_URL = "https://doc.comsol.com/6.4/docserver/"
+
+
+def result_html(title, segments, snippet, href):
+    crumbs = "".join(
+        f'<span class="searchResultsPathLink">{seg}</span><span class="searchResultsPathLink">&gt;</span>'
+        for seg in segments
+    )
+    return (
+        '<div class="v-verticallayout">'
+        f'<a class="searchResultsLink" href="{href}">{title}</a>'
+        f'<div class="searchResultsPath">{crumbs}</div>'
+        f'<div class="searchHit">{snippet}</div>'
+        '</div>'
+    )
+
+
+def search_page(*results):
+    return f'<html><body><div class="searchResults">{"".join(results)}</div></body></html>'
+
+
+@pytest.mark.parametrize("parts, expected", [
+    (["COMSOL Multiphysics", "Battery Design Module User's Guide", "Aging"],
+     "Battery Design Module User's Guide"),
+    (["COMSOL Multiphysics", "Application Programming Guide", "Model Object"],
+     "Application Programming Guide"),
+    (["COMSOL Multiphysics", "Reference Manual", "Meshing"], "Reference Manual"),
+    (["Java API"], "Java API"),
+    (["COMSOL Multiphysics"], "Unknown"),
+    ([], "Unknown"),
+])
+def test_detect_module(parts, expected):
+    assert detect_module(parts) == expected
+
+
+def test_clean_path_drops_consecutive_duplicates():
+    assert clean_path(["A", "B", "B", "C", "B"]) == "A > B > C > B"
+
+
+def test_clean_path_truncates_long_paths():
+    path = clean_path([f"Segment {i}" for i in range(100)])
+    assert path.startswith("...")
+    assert len(path) == 453
+
+
+def test_parse_search_results():
+    html = search_page(
+        result_html("Aging", ["COMSOL Multiphysics", "Battery Design Module", "Battery Design Module", "Aging"],
+                    "Capacity <b>fade</b> over time", "#!/battery/aging.html"),
+        result_html("Mesh", ["COMSOL Multiphysics", "Reference Manual", "Meshing"],
+                    "Free tetrahedral", "#!/comsol/mesh.html"),
+        result_html("Third", ["COMSOL Multiphysics", "Reference Manual"], "x", "#!/comsol/3.html"),
+    )
+    results = parse_search_results(html, "aging", "6.4", BASE_URL, max_results=2)
+
+    assert len(results) == 2
+    first = results[0]
+    assert first.title == "Aging"
+    assert first.module == "Battery Design Module"
+    assert first.path == "COMSOL Multiphysics > Battery Design Module > Aging"
+    assert first.snippet == "Capacity fade over time"
+    assert first.url == BASE_URL + "#!/battery/aging.html"
+    assert first.search_term == "aging"
+    assert first.version == "6.4"
+    assert results[1].module == "Reference Manual"
+
+
+def test_snippets_keep_line_breaks_and_truncate():
+    html = search_page(result_html("T", ["A", "B"], "line one<br>line two", "#!/a.html"))
+    assert parse_search_results(html, "t", "6.4", BASE_URL, 5)[0].snippet == "line one\nline two"
+
+    html = search_page(result_html("T", ["A", "B"], "x" * 500, "#!/a.html"))
+    snippet = parse_search_results(html, "t", "6.4", BASE_URL, 5)[0].snippet
+    assert snippet == "x" * 400 + "..."
+
+
+def test_link_without_href_has_no_url():
+    html = search_page('<a class="searchResultsLink">No link</a>')
+    assert parse_search_results(html, "t", "6.4", BASE_URL, 5)[0].url is None
+
+
+def test_parse_document_prefers_panels_and_skips_hidden_content():
+    long_text = "Heat transfer in solids is described by the heat equation. " * 2
+    html = (
+        '<html><head><title>ignored</title></head><body>'
+        '<noscript>Enable JavaScript</noscript>'
+        '<span class="searchResultsPathLink">Heat Transfer Module</span>'
+        f'<div class="v-panel-content"><h2>Theory</h2><p>{long_text}</p>'
+        '<p style="display: none">hidden paragraph</p>'
+        '<template><p>template text</p></template>'
+        '<script>var x = 1;</script>'
+        '<ul><li>First</li><li>Second</li></ul></div>'
+        '<div class="v-panel-content">short</div>'
+        '</body></html>'
+    )
+    doc = parse_document(html, "https://doc/page", "Theory")
+
+    assert doc.title == "Theory"
+    assert doc.breadcrumb == ["Heat Transfer Module"]
+    assert doc.content == f"Theory\n{long_text.strip()}\nFirst\nSecond"
+
+
+def test_parse_document_falls_back_to_body():
+    html = '<html><body><noscript>Enable JavaScript</noscript><p>Short page</p><!-- note --></body></html>'
+    assert parse_document(html, "u", "t").content == "Short page"
+
+
+def test_table_cells_are_tab_separated():
+    html = (
+        '<html><body><table><tr><th>Name</th><th>Value</th></tr>'
+        '<tr><td>Density</td><td>7850  kg/m^3</td></tr></table></body></html>'
+    )
+    assert parse_document(html, "u", "t").content == "Name\tValue\nDensity\t7850 kg/m^3"
+
+
+class BrowserTextPage:
+    """Answers innerText queries like a rendered page; has no HTML to parse."""
+
+    def __init__(self, texts):
+        self.texts = texts
+
+    def goto(self, url, **kwargs):
+        pass
+
+    def wait_for_selector(self, selector, **kwargs):
+        return self
+
+    def fill(self, text):
+        pass
+
+    def press(self, key):
+        pass
+
+    def title(self):
+        return "Theory"
+
+    def eval_on_selector_all(self, selector, script, arg=None):
+        return self.texts.get(selector, [])
+
+    def content(self):
+        raise AssertionError("single-shot calls read text in the browser")
+
+    def close(self):
+        pass
+
+
+def searcher_on(page):
+    searcher = ComsolDocSearcher(version="6.4")
+    searcher.browser = type("Browser", (), {"new_page": lambda self: page})()
+    return searcher
+
+
+def test_search_reads_browser_inner_text():
+    page = BrowserTextPage({
+        SEARCH_RESULTS_LINK_SELECTOR: [[" Aging \n", "#!/aging.html"]],
+        ".searchResultsPath": [["COMSOL Multiphysics", ">", "Battery Design Module"]],
+        SEARCH_HIT_SELECTOR: ["Cell\tValue\n"],
+    })
+    [result] = searcher_on(page).search("aging")
+    assert result.title == "Aging"
+    assert result.module == "Battery Design Module"
+    assert result.path == "COMSOL Multiphysics > Battery Design Module"
+    assert result.snippet == "Cell\tValue"
+    assert result.url == BASE_URL + "#!/aging.html"
+
+
+def test_retrieve_content_reads_browser_inner_text():
+    panel = "Name\tValue\n" + "x" * 60
+    page = BrowserTextPage({
+        SEARCH_RESULTS_PATH_SELECTOR: ["Heat Transfer Module", " "],
+        "body": ["whole page"],
+        ".v-panel-content": [f" {panel} ", "short"],
+    })
+    doc = searcher_on(page).retrieve_content("https://doc/page")
+    assert doc.title == "Theory"
+    assert doc.breadcrumb == ["Heat Transfer Module"]
+    assert doc.content == panel
@@ -0,0 +1,138 @@
+"""Tests for PostProcessor pipelining, its pending gauge and the batch command's validation."""
+
+from concurrent.futures import Future
+
+import pytest
+from typer.testing import CliRunner
+
+from comsol_doc import cli
+from comsol_doc.metrics import POSTPROCESS_PENDING
+from comsol_doc.pipeline import PostProcessor, process_search_html
+
+BASE_URL = "https://doc.comsol.com/6.4/docserver/"
+
+
+def page(title):
+    return (
+        '<html><body><a class="searchResultsLink" href="#!/a.html">'
+        f'{title}</a></body></html>'
+    )
+
+
+def capture(term):
+    return page(term), term, "6.4", BASE_URL, 5, None
+
+
+def test_inline_run_preserves_order():
+    with PostProcessor(workers=0) as processor:
+        out = [(term, future.result()[0][0].title)
+               for term, future in processor.run(["a", "b", "c"], capture, process_search_html)]
+    assert out == [("a", "a"), ("b", "b"), ("c", "c")]
+
+
+def test_pool_run_preserves_order_with_bounded_queue():
+    terms = [f"term {i}" for i in range(8)]
+    with PostProcessor(workers=2, max_pending=2) as processor:
+        titles = [future.result()[0][0].title
+                  for _, future in processor.run(terms, capture, process_search_html)]
+    assert titles == terms
+
+
+def test_formatting_runs_in_worker():
+    with PostProcessor(workers=0) as processor:
+        args = capture("a")[:-1] + ("markdown",)
+        results, formatted = processor.submit(process_search_html, *args).result()
+    assert "### 1. a" in formatted
+
+
+def test_errors_are_returned_per_item():
+    def flaky_capture(term):
+        if term == "bad":
+            raise RuntimeError("capture failed")
+        return capture(term)
+
+    with PostProcessor(workers=0) as processor:
+        futures = list(processor.run(["ok", "bad", "ok2"], flaky_capture, process_search_html))
+    assert [term for term, _ in futures] == ["ok", "bad", "ok2"]
+    assert isinstance(futures[1][1].exception(), RuntimeError)
+    assert futures[2][1].result()[0][0].title == "ok2"
+
+
+class ManualProcessor(PostProcessor):
+    """Futures stay pending until the test completes them."""
+
+    def __init__(self):
+        super().__init__(workers=0, max_pending=10)
+        self.futures = []
+
+    def submit(self, fn, *args):
+        self.futures.append(Future())
+        return self.futures[-1]
+
+
+def test_pending_gauge_recovers_when_consumer_stops_early():
+    before = POSTPROCESS_PENDING.value()
+    processor = ManualProcessor()
+
+    def capture_and_finish_first(term):
+        if term == "c":
+            processor.futures[0].set_result(None)
+        return ()
+
+    run = processor.run(["a", "b", "c", "d"], capture_and_finish_first, None)
+    assert next(run)[0] == "a"
+    assert POSTPROCESS_PENDING.value() == before + 2
+    run.close()
+    assert POSTPROCESS_PENDING.value() == before
+
+
+def test_pending_gauge_recovers_when_items_fail():
+    before = POSTPROCESS_PENDING.value()
+
+    def items():
+        yield "a"
+        yield "b"
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        list(ManualProcessor().run(items(), lambda term: (), None))
+    assert POSTPROCESS_PENDING.value() == before
+
+
+def test_batch_rejects_unknown_format(tmp_path, monkeypatch):
+    terms = tmp_path / "terms.txt"
+    terms.write_text("battery\n")
+
+    def no_browser(*args, **kwargs):
+        raise AssertionError("browser should not start")
+    monkeypatch.setattr(cli, "ComsolDocSearcher", no_browser)
+
+    result = CliRunner().invoke(
+        cli.app, ["batch", str(terms), "--output", str(tmp_path / "out"), "--format", "csv"]
+    )
+    assert result.exit_code == 1
+    assert "Unknown format" in result.output
+
+
+def test_batch_fails_when_every_search_fails(tmp_path, monkeypatch):
+    terms = tmp_path / "terms.txt"
+    terms.write_text("a\nb\n")
+
+    class FailingSearcher:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def search_many(self, terms, processor, **kwargs):
+            def fail(term):
+                raise RuntimeError("timeout")
+            return processor.run(terms, fail, process_search_html)
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(cli, "ComsolDocSearcher", FailingSearcher)
+    result = CliRunner().invoke(
+        cli.app, ["batch", str(terms), "--output", str(tmp_path / "out.jsonl"), "--workers", "0"]
+    )
+    assert result.exit_code == 1
+    assert "All 2 searches failed" in result.output
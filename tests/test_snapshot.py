@@ -0,0 +1,238 @@
+"""Tests for DocSnapshot and IncrementalUpdater using a fake searcher."""
+
+import http.client
+import json
+
+import pytest
+
+from comsol_doc import snapshot as snapshot_module
+from comsol_doc.config import TOC_COLLAPSED_SELECTOR, TOC_LINK_SELECTOR
+from comsol_doc.core import ComsolDocSearcher
+from comsol_doc.models import DocumentContent
+from comsol_doc.pipeline import PostProcessor
+from comsol_doc.snapshot import DocSnapshot, IncrementalUpdater
+
+
+def _render(url, content):
+    if content is None:
+        raise RuntimeError(f"render failed: {url}")
+    return DocumentContent(url=url, title=url, content=content, breadcrumb=["A"]), None
+
+
+class FakeSearcher:
+    """Serves pages from dicts instead of a browser."""
+
+    def __init__(self, pages, fingerprints=None):
+        self.pages = pages  # url -> content (None to fail rendering)
+        self.fingerprints = fingerprints or {}
+        self.rendered = []
+
+    def list_pages(self):
+        return list(self.pages)
+
+    def fetch_fingerprint(self, url):
+        return self.fingerprints.get(url)
+
+    def retrieve_many(self, urls, processor, format=None):
+        def capture(url):
+            self.rendered.append(url)
+            return url, self.pages[url]
+        return processor.run(urls, capture, _render)
+
+
+def update(tmp_path, searcher, urls=None, **kwargs):
+    snap = DocSnapshot(tmp_path, "6.4")
+    report = IncrementalUpdater(searcher, snap, PostProcessor(workers=0)).update(urls, **kwargs)
+    return snap, report
+
+
+def test_first_run_stores_all_pages(tmp_path):
+    searcher = FakeSearcher({"u1": "one", "u2": "two"}, {"u1": "f1", "u2": "f2"})
+    snap, report = update(tmp_path, searcher)
+    assert report.added == ["u1", "u2"]
+    assert report.refetched == 2
+    assert DocSnapshot(tmp_path, "6.4").get("u2").content == "two"
+
+
+def test_second_run_only_renders_changed_fingerprints(tmp_path):
+    update(tmp_path, FakeSearcher({"u1": "one", "u2": "two"}, {"u1": "f1", "u2": "f2"}))
+
+    searcher = FakeSearcher({"u1": "one", "u2": "TWO"}, {"u1": "f1", "u2": "f2b"})
+    _, report = update(tmp_path, searcher)
+    assert searcher.rendered == ["u2"]
+    assert report.changed == ["u2"]
+    assert report.unchanged == 1
+    assert DocSnapshot(tmp_path, "6.4").get("u2").content == "TWO"
+
+
+def test_same_content_after_fingerprint_change_is_unchanged(tmp_path):
+    update(tmp_path, FakeSearcher({"u1": "one"}, {"u1": "f1"}))
+    _, report = update(tmp_path, FakeSearcher({"u1": "one"}, {"u1": "f1b"}))
+    assert report.changed == []
+    assert report.unchanged == 1
+    assert report.refetched == 1
+
+
+def test_empty_listing_does_not_wipe_snapshot(tmp_path):
+    update(tmp_path, FakeSearcher({"u1": "one", "u2": "two"}))
+    snap, report = update(tmp_path, FakeSearcher({}), urls=[])
+    assert report.removed == []
+    assert report.kept_missing == ["u1", "u2"]
+    assert sorted(DocSnapshot(tmp_path, "6.4").urls()) == ["u1", "u2"]
+
+
+def test_large_drop_needs_prune(tmp_path):
+    pages = {f"u{i}": str(i) for i in range(10)}
+    update(tmp_path, FakeSearcher(pages))
+    remaining = {"u0": "0"}
+
+    _, report = update(tmp_path, FakeSearcher(remaining, {}))
+    assert report.removed == []
+    assert len(DocSnapshot(tmp_path, "6.4").urls()) == 10
+
+    _, report = update(tmp_path, FakeSearcher(remaining, {}), prune=True)
+    assert len(report.removed) == 9
+    assert DocSnapshot(tmp_path, "6.4").urls() == ["u0"]
+
+
+def test_small_drop_is_pruned(tmp_path):
+    pages = {f"u{i}": str(i) for i in range(10)}
+    update(tmp_path, FakeSearcher(pages))
+    del pages["u9"]
+    _, report = update(tmp_path, FakeSearcher(pages))
+    assert report.removed == ["u9"]
+    assert "u9" not in DocSnapshot(tmp_path, "6.4").urls()
+
+
+def test_failed_new_pages_are_not_reported_as_added(tmp_path):
+    _, report = update(tmp_path, FakeSearcher({"u1": "one", "u2": None}))
+    assert report.added == ["u1"]
+    assert list(report.failed) == ["u2"]
+    assert DocSnapshot(tmp_path, "6.4").urls() == ["u1"]
+
+
+def test_checkpoints_and_saves_on_interruption(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_module, "SNAPSHOT_CHECKPOINT_INTERVAL", 2)
+
+    class Interrupted(FakeSearcher):
+        def retrieve_many(self, urls, processor, format=None):
+            for i, item in enumerate(super().retrieve_many(urls, processor, format)):
+                if i == 3:
+                    raise KeyboardInterrupt
+                yield item
+
+    with pytest.raises(KeyboardInterrupt):
+        update(tmp_path, Interrupted({f"u{i}": str(i) for i in range(6)}))
+    manifest = json.loads((tmp_path / DocSnapshot.MANIFEST_NAME).read_text())
+    assert sorted(manifest["pages"]) == ["u0", "u1", "u2"]
+
+
+def test_version_mismatch_is_rejected(tmp_path):
+    update(tmp_path, FakeSearcher({"u1": "one"}))
+    with pytest.raises(ValueError):
+        DocSnapshot(tmp_path, "6.3")
+
+
+@pytest.mark.parametrize("error", [
+    OSError("network down"),
+    http.client.IncompleteRead(b""),
+    http.client.InvalidURL("bad"),
+    ValueError("unknown url type"),
+])
+def test_fetch_fingerprint_returns_none_on_failure(monkeypatch, error):
+    def fail(*args, **kwargs):
+        raise error
+    monkeypatch.setattr("urllib.request.urlopen", fail)
+    searcher = ComsolDocSearcher(version="6.4")
+    assert searcher.fetch_fingerprint("https://doc.comsol.com/6.4/docserver/#!/a/b.html") is None
+
+
+def test_fetch_fingerprint_without_page_path():
+    assert ComsolDocSearcher(version="6.4").fetch_fingerprint("https://example.com/") is None
+
+
+class FakeTocNode:
+    """A lazily expanded table-of-contents node linking to one page."""
+
+    def __init__(self, href, children=(), expandable=True):
+        self.href = href
+        self.children = list(children)
+        self.expandable = expandable and bool(self.children)
+        self.expanded = False
+
+    def visible(self):
+        yield self
+        if self.expanded:
+            for child in self.children:
+                yield from child.visible()
+
+    def click(self, position=None):
+        assert position is not None, "clicking the caption would open the page"
+        self.expanded = True
+
+    def get_attribute(self, name):
+        return self.href
+
+
+class FakeTocPage:
+    def __init__(self, roots):
+        self.roots = roots
+
+    def nodes(self):
+        return [node for root in self.roots for node in root.visible()]
+
+    def goto(self, url, **kwargs):
+        pass
+
+    def wait_for_selector(self, selector, **kwargs):
+        pass
+
+    def wait_for_load_state(self, state, **kwargs):
+        pass
+
+    def query_selector_all(self, selector):
+        if selector == TOC_COLLAPSED_SELECTOR:
+            return [node for node in self.nodes() if node.expandable and not node.expanded]
+        assert selector == TOC_LINK_SELECTOR
+        return self.nodes()
+
+    def close(self):
+        pass
+
+
+class FakeTocBrowser:
+    def __init__(self, page):
+        self.page = page
+
+    def new_page(self):
+        return self.page
+
+
+def list_pages(roots):
+    searcher = ComsolDocSearcher(version="6.4")
+    searcher.browser = FakeTocBrowser(FakeTocPage(roots))
+    return searcher.list_pages()
+
+
+def test_list_pages_expands_nested_toc():
+    roots = [
+        FakeTocNode("#!/a.html", [
+            FakeTocNode("#!/a1.html", [FakeTocNode("#!/a1x.html"), FakeTocNode("#!/a1x.html#sec")]),
+            FakeTocNode("#!/a2.html"),
+        ]),
+        FakeTocNode("#!/b.html", [FakeTocNode("#!/b1.html", [FakeTocNode("#!/b1x.html")])]),
+    ]
+    base = "https://doc.comsol.com/6.4/docserver/#!/"
+    assert list_pages(roots) == [
+        base + name for name in ("a.html", "a1.html", "a1x.html", "a2.html", "b.html", "b1.html", "b1x.html")
+    ]
+
+
+def test_list_pages_fails_when_toc_cannot_be_expanded(monkeypatch):
+    class StuckNode(FakeTocNode):
+        def click(self, position=None):
+            pass
+
+    monkeypatch.setattr("comsol_doc.core.TOC_MAX_DEPTH", 3)
+    with pytest.raises(Exception, match="collapsed nodes"):
+        list_pages([StuckNode("#!/a.html", [FakeTocNode("#!/a1.html")])])